@@ -1,5 +1,5 @@
 # main.py
-from modules.player import MusicPlayer
+from modules.player import MusicPlayer, clear_screen
 from modules.cli import MusicPlayerCLI
 import environ
 
@@ -8,6 +8,7 @@ environ.Env.read_env()
 
 def main():
     """Main entry point for the music player"""
+    clear_screen()
     player = MusicPlayer(env)
     cli = MusicPlayerCLI(player)
     cli.run()
@@ -2,10 +2,22 @@ import threading
 import time
 import readchar
 import os
+from dataclasses import dataclass
 from modules.player import PlayerState, clear_screen
 from modules.logging_utils import log_function_call,  app_logger as log
 
 
+@dataclass(slots=True)
+class PaginationResult:
+    """Outcome of a pagination session.
+
+    kind is 'index' (value is the selected item's index), 'key' (value is a
+    special key pressed by the user) or 'action' (value is whatever a custom
+    action returned).
+    """
+    kind: str
+    value: object
+
 
 class MusicPlayerCLI:
     """Command-line interface for the music player"""
@@ -314,8 +326,11 @@ class MusicPlayerCLI:
                 self.player.load_playlist(playlist_name)
                 print(f"Loaded playlist: {playlist_name}")
             
-            # Set index and play
-            idx = tracks.index(track)
+            # Set index and play. The index is a position in the active playlist,
+            # which the player looks up in its position map instead of scanning
+            idx = self.player.track_position(track)
+            if idx is None:
+                idx = tracks.index(track)
             self.player.current_index = idx
             self.stop(args)
             self.play(args)
@@ -752,6 +767,12 @@ class MusicPlayerCLI:
             display_thread.daemon = True
             display_thread.start()
             
+            # Bind key constants once so the input loop uses fast local lookups
+            K_SPACE, K_LEFT, K_RIGHT, K_UP, K_DOWN = (
+                readchar.key.SPACE, readchar.key.LEFT, readchar.key.RIGHT,
+                readchar.key.UP, readchar.key.DOWN
+            )
+            
             # Main thread handles input
             while True:
                 key = readchar.readkey()
@@ -782,7 +803,7 @@ class MusicPlayerCLI:
                     return None
                 
                 # Handle different key commands
-                if key == readchar.key.SPACE:
+                if key == K_SPACE:
                     if active_plugin == 'local':
                         # Toggle local playback using playback state instead of direct enum access
                         if current_playback['state'] == 'PLAYING':
@@ -798,19 +819,19 @@ class MusicPlayerCLI:
                 elif key == 's':
                     self.player.toggle_shuffle()
                 
-                elif key in (readchar.key.LEFT, readchar.key.RIGHT):
+                elif key in (K_LEFT, K_RIGHT):
                     if active_plugin == 'local':
                         args = ""
-                        self.previous_track(args) if key == readchar.key.LEFT else self.next_track(args)
+                        self.previous_track(args) if key == K_LEFT else self.next_track(args)
                     else:
                         plugin = get_plugin_instance()
                         if plugin:
-                            command = 'prev' if key == readchar.key.LEFT else 'next'
+                            command = 'prev' if key == K_LEFT else 'next'
                             self.plugin_command(plugin, active_plugin, [command])
                 
-                elif key in (readchar.key.UP, readchar.key.DOWN):
+                elif key in (K_UP, K_DOWN):
                     # Calculate new volume based on key
-                    volume_change = 0.05 if key == readchar.key.UP else -0.05
+                    volume_change = 0.05 if key == K_UP else -0.05
                     new_vol = max(0.0, min(1.0, self.player.volume + volume_change))
                     
                     # Apply volume change
@@ -952,77 +973,6 @@ class MusicPlayerCLI:
             custom_actions=custom_actions
         )
                 
-    def get_paginated_selection(self, items, title="Items", play_action=None, custom_actions=None):
-        """
-        Utility method that plugins can use to display paginated lists.
-        
-        Args:
-            items: List of items to paginate
-            title: Title to display in the header
-            play_action: Function to call when an item is selected with Enter (receives selected item)
-            custom_actions: Dictionary of key -> (display_name, function) for special keys
-        
-        Returns:
-            Selected item or None if canceled
-        """
-        if not items:
-            print(f"No {title.lower()} to display")
-            return None
-        
-        # Custom formatter for items
-        def item_formatter(i, item, is_current, is_selected):
-            selector = "→ " if is_selected else "  "
-            # If item is a tuple/list, assume first element is display text
-            if isinstance(item, (tuple, list)):
-                display_text = item[0]
-            else:
-                display_text = str(item)
-            return f"{selector}{i}. {display_text}"
-        
-        # Create footer with base and custom actions
-        def footer(page, total_pages):
-            print(f"\nPage {page}/{total_pages} - Options:")
-            print("  → / ← - Next/Previous page")
-            print("  ↑ / ↓ - Move selector")
-            
-            if play_action:
-                print("  Enter - Select item")
-                
-            # Add custom actions to footer
-            if custom_actions:
-                for key, (display_name, _) in custom_actions.items():
-                    print(f"  {key} - {display_name}")
-                    
-            print("  c - Cancel")
-        
-        # Show paginated list
-        result = self.paginate_items(
-            items,
-            header=lambda page, total: print(f"\n{title} ({len(items)}) - Page {page}/{total}:"),
-            footer=footer,
-            item_formatter=item_formatter
-        )
-        
-        if result is None:
-            return None  # User canceled
-        
-        # If result is a special key and we have custom actions
-        if isinstance(result, str) and custom_actions and result in custom_actions:
-            _, action_function = custom_actions[result]
-            return action_function()
-            
-        # If normal selection and we have a play action
-        if not isinstance(result, str) and play_action:
-            selected_item = items[result]
-            play_action(selected_item)
-            return selected_item
-            
-        # Just return the selected item/key
-        if isinstance(result, str):
-            return result
-        else:
-            return items[result]
-            
     def paginate_items(self, items, page_size=20, header=None, footer=None, item_formatter=None, 
                   current_index=None, play_callback=None, custom_actions=None, title=None):
         """
@@ -1040,7 +990,7 @@ class MusicPlayerCLI:
             title: Title to display at the top of the pagination
         
         Returns:
-            Selected item or None if canceled
+            PaginationResult describing the selection, or None if canceled
         """        
         if not items:
             print("No items to display")
@@ -1092,6 +1042,12 @@ class MusicPlayerCLI:
         # Cursor position within the current page
         self.paginate_cursor_position = 0
         
+        # Bind key constants once so the navigation loop uses fast local lookups
+        K_LEFT, K_RIGHT, K_UP, K_DOWN, K_ENTER = (
+            readchar.key.LEFT, readchar.key.RIGHT, readchar.key.UP,
+            readchar.key.DOWN, readchar.key.ENTER
+        )
+        
         while True:
             # Calculate slice for current page
             start_idx = (current_page - 1) * page_size
@@ -1134,14 +1090,14 @@ class MusicPlayerCLI:
             key = readchar.readkey()
             
             # Handle navigation with arrow keys
-            if key == readchar.key.RIGHT:
+            if key == K_RIGHT:
                 if current_page < total_pages:
                     current_page += 1
                     self.paginate_cursor_position = 0  # Reset cursor position on page change
                 else:
                     print("Already on the last page")
             
-            elif key == readchar.key.LEFT:
+            elif key == K_LEFT:
                 if current_page > 1:
                     current_page -= 1
                     self.paginate_cursor_position = 0  # Reset cursor position on page change
@@ -1149,14 +1105,14 @@ class MusicPlayerCLI:
                     print("Already on the first page")
             
             # Handle cursor movement
-            elif key == readchar.key.UP:
+            elif key == K_UP:
                 if self.paginate_cursor_position > 0:
                     self.paginate_cursor_position -= 1
                 else:
                     # Wrap to bottom if at top
                     self.paginate_cursor_position = items_on_page - 1
             
-            elif key == readchar.key.DOWN:
+            elif key == K_DOWN:
                 if self.paginate_cursor_position < items_on_page - 1:
                     self.paginate_cursor_position += 1
                 else:
@@ -1164,7 +1120,7 @@ class MusicPlayerCLI:
                     self.paginate_cursor_position = 0
             
             # Handle select with Enter
-            elif key == readchar.key.ENTER:
+            elif key == K_ENTER:
                 # Calculate the absolute index in the items list
                 selected_index = start_idx + self.paginate_cursor_position
                 selected_item = items[selected_index]
@@ -1173,7 +1129,7 @@ class MusicPlayerCLI:
                 if play_callback:
                     play_callback(selected_item)
                 
-                return selected_item
+                return PaginationResult(kind='index', value=selected_index)
             
             # Handle cancel
             elif key.lower() == 'c':
@@ -1188,11 +1144,11 @@ class MusicPlayerCLI:
                 
                 # If action returns something, return it
                 if result is not None:
-                    return result
+                    return PaginationResult(kind='action', value=result)
             
             # Return special keys for command handling in caller functions
             elif key.lower() in ['a', 'l', 's', 'h']:
-                return key.lower()
+                return PaginationResult(kind='key', value=key.lower())
             
             else:
                 # Ignore other keys
@@ -1214,12 +1170,22 @@ class MusicPlayerCLI:
         # Reset cursor position to 0 before starting pagination
         self.paginate_cursor_position = 0
         
-        return self.paginate_items(
+        result = self.paginate_items(
             items=items,
             title=title,
             play_callback=play_action,
             custom_actions=custom_actions
         )
+        
+        if result is None:
+            return None  # User canceled
+        
+        # Selections map back to the item, keys and action results pass through
+        match result.kind:
+            case 'index':
+                return items[result.value]
+            case _:
+                return result.value
                 
     def show_settings_menu(self, args):
         """Show and manage player settings."""
@@ -1,45 +1,106 @@
 # modules/media_handler.py
 import os
+import sys
 import pygame
 import tempfile
+import io
 import json
 import time
+import threading
+import zlib
+import hashlib
+import re
 import random
+import heapq
+import shutil
+import wave
 import ffmpeg
 from tinytag import TinyTag
-import urllib.request
-from pathlib import Path
 from datetime import datetime
-from pydub import AudioSegment
+from operator import itemgetter
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from modules.logging_utils import app_logger as log
-from typing import Dict, Any, Optional, List, Union, TypedDict, Literal, TypeVar, Generic
+from typing import Dict, Any, Optional, List, Union
+
+# Splits lowercased filenames and queries into search tokens
+TOKEN_SPLIT = re.compile(r'[^a-z0-9]+')
+
+# RapidFuzz is optional; search_tracks falls back to substring scoring without it
+try:
+    from rapidfuzz import process as fuzz_process, fuzz
+except ImportError:
+    fuzz_process = None
+
+# orjson is optional; the index is plain JSON either way, orjson just encodes it in C
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# platformdirs is optional; without it the cache lives under ~/.cache
+try:
+    import platformdirs
+except ImportError:
+    platformdirs = None
 
 class MediaHandler:
     """Handles media operations like loading, converting, indexing, and getting track information."""
     
+    uses_pygame_mixer = True  # Plays through pygame.mixer.music, so the player initializes the mixer
+    
     def __init__(self):
         """Initialize the media handler."""
-        # Create temp directory for conversions
+        # Create temp directory for downloads
         self.temp_dir = tempfile.mkdtemp()
-        self.converted_files = {}
+        self.converted_files = {}  # Source path -> cached WAV conversion
+        # Conversions persist across sessions, keyed by source path/mtime/size
+        if platformdirs:
+            cache_root = platformdirs.user_cache_dir("shell_shock")
+        else:
+            cache_root = os.path.join(os.path.expanduser("~"), ".cache", "shell_shock")
+        self.cache_dir = os.path.join(cache_root, "converted")
+        self.cache_max_bytes = 1024 ** 3  # Least recently used conversions are pruned above 1 GiB
+        # Sources under these directories are one-off downloads, so they are never cached
+        self._temp_roots = tuple(os.path.join(os.path.realpath(root), '')
+                                 for root in (self.temp_dir, tempfile.gettempdir()))
         
         # Define supported formats
         self.pygame_supported = ['.mp3', '.wav', '.ogg']
         self.pydub_supported = ['.m4a', '.aac', '.flac', '.mp4', '.wma']
         self.all_supported = self.pygame_supported + self.pydub_supported
+        # Tuple of extensions so a filename is checked with a single endswith call
+        self._audio_exts = tuple(sorted(set(self.all_supported)))
         
         # Media indexing properties
         self.media_index = {}  # Path -> metadata
         self.media_locations = []  # List of directories being indexed
+        self._locations_tuple = None  # Cached snapshot for get_media_locations
         self.last_update = None  # When index was last updated
-        self.index_file = "media_index.json"  # Where to store the index
+        self.index_dir = "media_index.d"  # Where to store the sharded index
+        self.legacy_index_file = "media_index.json"  # Single-file index from older versions
+        self.index_shards = 16  # Number of shard files the index is split across
+        self._index_lock = threading.Lock()  # Guards bulk index merges
+        self._save_lock = threading.Lock()  # One index save at a time (timer, main and library threads)
+        self._dirty_shards = set()  # Shards with changes not yet written to disk
+        self._save_timer = None  # Pending write-behind flush
+        self.save_interval = 30  # Seconds between write-behind flushes
+        self.scan_workers = 16  # Directories listed concurrently during a full index update
+        self._search_paths = []  # Index paths, parallel to _search_names
+        self._search_names = []  # Lowercased filenames used by search_tracks
+        self._by_name = []  # Index paths ordered by filename
+        self._by_date = []  # Index paths ordered by date added
+        self._token_index = {}  # Filename token -> set of index paths
+        self.index_version = 0  # Bumped whenever the indexed track set may have changed
+        
+        # Shared HTTP session so downloads reuse pooled keep-alive connections;
+        # created on the first download so indexing never imports requests
+        self._http = None
         
         # Event bus reference (will be set by MusicPlayer)
         self.event_bus = None
         
-        # Initialize pygame mixer if not already initialized
-        if not pygame.mixer.get_init():
-            pygame.mixer.init(frequency=44100)
+        # The mixer opens the audio device, so it is only initialized on first playback
+        self._mixer_ready = False
         
         # Load any existing index
         self._load_index()
@@ -52,16 +113,28 @@ class MediaHandler:
         """Get a list of all supported file formats."""
         return self.all_supported
     
-    def add_media_location(self, directories: List[str]):
+    def add_media_location(self, directories: Union[str, List[str]]):
         """Add a new location or locations to be indexed.
         
         Args:
-            directories (List[str]): Path to the directory to index
+            directories (Union[str, List[str]]): Path or paths of directories to index
+            
+        Returns:
+            bool: True if at least one new location was added
         """
+        # A bare string would otherwise be iterated character by character
+        if isinstance(directories, str):
+            directories = [directories]
+        
+        added = False
         for directory in directories:
             directory = os.path.abspath(directory)
             if directory not in self.media_locations and os.path.exists(directory):
                 self.media_locations.append(directory)
+                added = True
+        if added:
+            self._locations_tuple = None
+        return added
 
     def get_metadata_from_file(self, file_path: str) -> Optional[Dict[str, Any]]:
         """Get metadata for a media file from the index.
@@ -123,108 +196,376 @@ class MediaHandler:
                 
             return metadata
         except Exception as e:
-            log.error(f"Error getting metadata: {e}")
+            log.error("Error getting metadata: %s", e)
             return None
 
     def remove_media_location(self, directory):
-        """Remove a location from the index.
+        """Remove a location and its files from the index.
+        
+        Only the entries under the removed directory are dropped, so the
+        rest of the library is not rescanned. Files that are also under
+        another indexed location stay in the index.
         
         Args:
             directory (str): Path to the directory to remove
             
         Returns:
-            bool: True if removed, False if not found
+            set: Paths removed from the index (possibly empty), or None if
+            the directory was not an indexed location
         """
         directory = os.path.abspath(directory)
-        if directory in self.media_locations:
-            self.media_locations.remove(directory)
-            return True
-        return False
+        if directory not in self.media_locations:
+            return None
+        self.media_locations.remove(directory)
+        self._locations_tuple = None
+        
+        prefix = os.path.join(directory, '')
+        still_covered = tuple(os.path.join(location, '') for location in self.media_locations)
+        with self._index_lock:
+            removed = {path for path in self.media_index
+                       if path.startswith(prefix)
+                       and not (still_covered and path.startswith(still_covered))}
+            for path in removed:
+                del self.media_index[path]
+                self._mark_dirty(path)
+        
+        self._rebuild_index_views()
+        self._save_index()
+        return removed
     
     def get_media_locations(self):
         """Get all media locations being indexed.
         
+        The same tuple is returned until a location is added or removed, so
+        frequent callers don't allocate a copy each time. Callers that need
+        to modify it must make their own list.
+        
         Returns:
-            list: List of directory paths
+            tuple: Directory paths
         """
-        return self.media_locations.copy()
+        if self._locations_tuple is None:
+            self._locations_tuple = tuple(self.media_locations)
+        return self._locations_tuple
     
-    def update_media_index(self, force=False):
-        """Update the media index by scanning provided file paths.
+    def update_media_index(self, force=False, rebuild=False):
+        """Update the media index by scanning every media location.
+        
+        Only files whose (mtime, size) signature changed are re-probed, so a
+        refresh of an unchanged library costs one stat per file.
         
         Args:
-            file_paths (list): List of file path strings to process
-            force (bool): Force complete rebuild even if not needed
+            force (bool): Scan even if the index was updated within the last hour
+            rebuild (bool): Re-probe every file, not just new or changed ones
             
         Returns:
             int: Number of files indexed
         """
         # Check if we need to update
-        if not force and self.last_update and time.time() - self.last_update < 3600:
+        if not (force or rebuild) and self.last_update and time.time() - self.last_update < 3600:
             # Skip if updated less than an hour ago and not forced
             return len(self.media_index)
         
-        # Track invalid entries to remove
-        to_remove = set(self.media_index.keys())
+        # Walk every location once to find what is on disk now
+        discovered = self._scan_signatures_parallel(self.media_locations)
         
-        # Process each file path in the list
-        for file_path in self.media_index:
-            # print(f"Indexing: {file_path}")
-            # Create or update file entry
-            filename = os.path.basename(file_path)
-            
-            # Get the directory from the file path
-            directory = os.path.dirname(file_path)
+        self._reconcile_index(discovered, self.media_index.keys(), rebuild=rebuild)
+        self.last_update = time.time()
+        self._rebuild_index_views()
+        self._save_index()
+        
+        return len(self.media_index)
+    
+    def scan_and_index(self, directory, recursive=False):
+        """Scan one directory and bring its index entries up to date in the same pass.
+        
+        Args:
+            directory (str): Directory path to scan
+            recursive (bool): Whether to scan subdirectories
             
-            # If file already in index, mark as still valid
-            if file_path in to_remove:
-                to_remove.remove(file_path)
+        Returns:
+            tuple: (tracks, mtimes) - the media paths found and a path -> mtime dict
+        """
+        # Index keys are absolute, so scan from the absolute path
+        directory = os.path.abspath(directory)
+        discovered = self._scan_signatures(directory, recursive)
+        
+        # Only entries this scan could have seen are candidates for removal
+        if recursive:
+            prefix = os.path.join(directory, '')
+            scope = [path for path in self.media_index if path.startswith(prefix)]
+        else:
+            scope = [path for path, entry in self.media_index.items()
+                     if entry.get('directory') == directory]
+        
+        self._reconcile_index(discovered, scope)
+        self._rebuild_index_views()
+        self._save_index()
+        
+        return list(discovered), {path: mtime for path, (mtime, _) in discovered.items()}
+    
+    def _scan_signatures(self, directory, recursive):
+        """Map each media file under a directory to its (mtime, size) signature."""
+        signatures = {}
+        for entry in self._scan_media(directory, recursive):
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue  # Removed while scanning
+            signatures[sys.intern(entry.path)] = (stat.st_mtime, stat.st_size)
+        return signatures
+    
+    def _scan_signatures_parallel(self, directories):
+        """Recursively map media files under several directories to (mtime, size).
+        
+        Each directory listing runs on a worker thread, and subdirectories are
+        submitted as soon as their parent has been read. On network mounts the
+        cost is mostly per-directory round trips, so keeping several listings
+        in flight is much faster than a sequential walk. Symlinks are followed;
+        each directory is listed once, so symlink loops end the walk.
+        
+        Args:
+            directories (list): Root directories to scan
             
-            # Get file metadata if not already indexed
-            if file_path not in self.media_index:
-                # Create basic metadata
-                duration = self.get_track_duration(file_path)
-                
-                self.media_index[file_path] = {
-                    'filename': filename,
-                    'path': file_path,
-                    'directory': directory,
-                    'duration': duration,
-                    'last_played': None,
-                    'play_count': 0,
-                    'added_on': datetime.now().isoformat()
-                }
+        Returns:
+            dict: Path -> (mtime, size) for every supported media file found
+        """
+        signatures = {}
+        roots = [directory for directory in directories if os.path.isdir(directory)]
+        if not roots:
+            return signatures
+        
+        visited = set()  # (st_dev, st_ino) of every directory already submitted
+        with ThreadPoolExecutor(max_workers=self.scan_workers) as executor:
+            pending = set()
+            for root in roots:
+                key = self._directory_key(root)
+                if key not in visited:
+                    visited.add(key)
+                    pending.add(executor.submit(self._scan_one_directory, root))
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    files, subdirs = future.result()
+                    signatures.update(files)
+                    for subdir, key in subdirs:
+                        if key not in visited:
+                            visited.add(key)
+                            pending.add(executor.submit(self._scan_one_directory, subdir))
+        return signatures
+    
+    def _scan_one_directory(self, directory):
+        """List a single directory for the parallel scanner.
+        
+        Returns:
+            tuple: ({path: (mtime, size)} for media files,
+            [(subdirectory path, (st_dev, st_ino))])
+        """
+        audio_exts = self._audio_exts
+        files, subdirs = {}, []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_file():
+                            if entry.name.lower().endswith(audio_exts):
+                                stat = entry.stat()
+                                files[sys.intern(entry.path)] = (stat.st_mtime, stat.st_size)
+                        elif entry.is_dir():
+                            stat = entry.stat()
+                            subdirs.append((entry.path, (stat.st_dev, stat.st_ino)))
+                    except OSError:
+                        continue  # Removed while scanning
+        except OSError as e:
+            log.warning("Error scanning %s: %s", directory, e)
+        return files, subdirs
+    
+    def _reconcile_index(self, discovered, scope, rebuild=False):
+        """Bring the index in line with a scan.
+        
+        Args:
+            discovered (dict): Path -> (mtime, size) for every file the scan found
+            scope: Indexed paths the scan covered; those not found are removed
+            rebuild (bool): Re-probe every discovered file regardless of signature
+        """
+        # Reconcile the index against the scan with set differences
+        indexed = self.media_index.keys()
+        to_add = discovered.keys() - indexed
+        to_remove = set(scope) - discovered.keys()
+        
+        # A rebuild re-probes everything; otherwise files still present are
+        # re-probed only if their signature changed
+        new_paths = list(discovered if rebuild else to_add)
+        existing = () if rebuild else discovered.keys() & indexed
+        for file_path in existing:
+            entry = self.media_index[file_path]
+            mtime, size = discovered[file_path]
+            if entry.get('mtime') != mtime or entry.get('size', size) != size:
+                new_paths.append(file_path)
+            elif 'size' not in entry:
+                # Indexed before sizes were recorded; fill it in without re-probing
+                entry['size'] = size
+                self._mark_dirty(file_path)
+        
+        # Probe metadata for new or changed files concurrently
+        failed = self._index_files(new_paths)
+        if failed:
+            # One summary line instead of an error per unreadable file
+            log.warning("Could not read the duration of %d files; using the default", len(failed))
+            log.debug("Files with unreadable durations: %s", failed)
         
         # Remove files that no longer exist
         for file_path in to_remove:
             if file_path in self.media_index:
                 del self.media_index[file_path]
+                self._mark_dirty(file_path)
+    
+    def _probe_file(self, file_path):
+        """Probe a file's duration, modification time and size for the index.
         
-        self.last_update = time.time()
-        self._save_index()
+        Returns:
+            tuple: (duration, mtime, size); any is None if it couldn't be read
+        """
+        try:
+            stat = os.stat(file_path)
+            mtime, size = stat.st_mtime, stat.st_size
+        except OSError:
+            mtime = size = None
+        return self._probe_duration(file_path), mtime, size
+    
+    def _index_files(self, file_paths):
+        """Probe metadata for new or changed files and store it in the index.
         
-        return len(self.media_index)
+        Duration probing blocks on file reads and ffprobe subprocesses, so the
+        probes run on a thread pool and overlap instead of running serially.
+        Existing entries keep their play statistics.
+        
+        Args:
+            file_paths (list): Paths of files to (re)index
+            
+        Returns:
+            list: Paths whose duration couldn't be read (indexed with the default)
+        """
+        if not file_paths:
+            return []
+        
+        max_workers = min(32, (os.cpu_count() or 1) * 4, len(file_paths))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            probes = list(executor.map(self._probe_file, file_paths))
+        
+        added_on = time.time()
+        failed = []
+        with self._index_lock:
+            for file_path, (duration, mtime, size) in zip(file_paths, probes):
+                if duration is None:
+                    failed.append(file_path)
+                    duration = 180  # Default 3 minutes
+                entry = self.media_index.get(file_path)
+                if entry:
+                    # Changed on disk: refresh probed fields only
+                    entry['duration'] = duration
+                    entry['mtime'] = mtime
+                    entry['size'] = size
+                else:
+                    file_path = sys.intern(file_path)
+                    self.media_index[file_path] = {
+                        'filename': os.path.basename(file_path),
+                        'path': file_path,
+                        'directory': sys.intern(os.path.dirname(file_path)),
+                        'duration': duration,
+                        'mtime': mtime,
+                        'size': size,
+                        'last_played': None,
+                        'play_count': 0,
+                        'added_on': added_on
+                    }
+                self._mark_dirty(file_path)
+        return failed
+    
+    def _rebuild_index_views(self):
+        """Rebuild the search lists and sorted track views after the index changes.
+        
+        Sorting happens once per index update, so get_all_indexed_tracks
+        never has to sort on a read.
+        """
+        with self._index_lock:
+            self._search_paths = list(self.media_index.keys())
+            self._search_names = [self.media_index[path]['filename'].lower()
+                                  for path in self._search_paths]
+            order = sorted(range(len(self._search_paths)), key=self._search_names.__getitem__)
+            self._by_name = [self._search_paths[i] for i in order]
+            # added_on is a POSIX timestamp, so the sort compares plain floats.
+            # Keys are computed in one pass so the sort itself calls no Python code
+            index = self.media_index
+            date_keys = [index[path].get('added_on') or index[path].get('mtime') or 0
+                         for path in self._search_paths]
+            order = sorted(range(len(date_keys)), key=date_keys.__getitem__)
+            self._by_date = [self._search_paths[i] for i in order]
+            
+            # Inverted index so whole-word queries only touch matching files
+            token_index = {}
+            for path, name in zip(self._search_paths, self._search_names):
+                for token in TOKEN_SPLIT.split(name):
+                    if token:
+                        token_index.setdefault(token, set()).add(path)
+            self._token_index = token_index
+            self.index_version += 1
     
-    def get_all_indexed_tracks(self, sort_method='name', shuffle=False):
+    def get_all_indexed_tracks(self, sort_method='name', shuffle=False, limit=None):
         """Get all tracks from the index, with optional sorting.
         
         Args:
             sort_method (str): How to sort - 'name', 'date', 'random'
             shuffle (bool): Whether to shuffle the results
+            limit (int, optional): Maximum number of tracks to return
             
         Returns:
             list: Paths to all tracks
         """
-        # Get all tracks
-        tracks = list(self.media_index.keys())
-        return tracks
+        # Random order samples the path list directly instead of copying then shuffling.
+        # random.sample is a partial shuffle, so a limit only costs O(limit) picks
+        if shuffle or sort_method == 'random':
+            count = len(self._search_paths)
+            if limit is not None:
+                count = min(limit, count)
+            return random.sample(self._search_paths, count)
+        
+        # Sorted views are maintained on index updates
+        if sort_method == 'name':
+            view = self._by_name
+        elif sort_method == 'date':
+            view = self._by_date
+        else:
+            view = self._search_paths
+        return list(view[:limit]) if limit is not None else list(view)
     
-    def search_tracks(self, query, limit=20):
+    def iter_all_indexed_tracks(self, sort_method='name'):
+        """Iterate over all tracks in the index without copying them.
+        
+        The sorted views are replaced rather than modified when the index
+        changes, so an iterator keeps walking the view it started on.
+        
+        Args:
+            sort_method (str): How to sort - 'name', 'date', 'random'
+            
+        Returns:
+            iterator: Paths to all tracks
+        """
+        if sort_method == 'random':
+            return iter(random.sample(self._search_paths, len(self._search_paths)))
+        if sort_method == 'name':
+            return iter(self._by_name)
+        if sort_method == 'date':
+            return iter(self._by_date)
+        return iter(self._search_paths)
+    
+    def search_tracks(self, query, limit=20, *, locations=None, media_types=None):
         """Search for media files by name across all indexed locations.
         
         Args:
             query (str): Search string
             limit (int): Maximum number of results
+            locations (list, optional): Only search files under these directories
+            media_types (list, optional): Only search files with these extensions
             
         Returns:
             list: Media files matching the query
@@ -233,42 +574,100 @@ class MediaHandler:
             return []
             
         query = query.lower()
+        paths, names = self._search_paths, self._search_names
+        
+        filtered = False
+        
+        # If every query word is a known filename token, the files containing
+        # all of them can be ranked on their own, but only when there are
+        # enough of them to fill the results. Otherwise the whole index is
+        # scored, so prefix and substring matches ("love" -> "lovely") still count
+        tokens = [token for token in TOKEN_SPLIT.split(query) if token]
+        postings = [self._token_index.get(token) for token in tokens]
+        if postings and all(postings):
+            postings.sort(key=len)
+            candidates = postings[0].intersection(*postings[1:])
+            if len(candidates) >= limit:
+                token_paths = list(candidates)
+                token_names = [self.media_index[path]['filename'].lower() for path in token_paths]
+                if locations or media_types:
+                    token_paths, token_names = self._filter_candidates(token_paths, token_names,
+                                                                       locations, media_types)
+                if len(token_paths) >= limit:
+                    paths, names, filtered = token_paths, token_names, True
+        
+        # Apply the filters before scoring so the limit counts only files that qualify
+        if not filtered and (locations or media_types):
+            paths, names = self._filter_candidates(paths, names, locations, media_types)
+        
+        # Let RapidFuzz score the filenames in native code when available
+        if fuzz_process is not None:
+            matches = fuzz_process.extract(
+                query,
+                names,
+                scorer=fuzz.token_set_ratio,
+                limit=limit,
+                score_cutoff=50,
+                processor=None
+            )
+            return [paths[index] for _, _, index in matches]
+        
         results = []
         
+        # The query is split once; names and paths are already parallel columns
+        query_parts = query.split()
+        part_count = len(query_parts)
+        
         # Score each file
-        for file_path, metadata in self.media_index.items():
-            filename = metadata['filename'].lower()
+        for file_path, filename in zip(paths, names):
             
-            # Simple substring search - for fuzzy search, install fuzzywuzzy
-            if query in filename:
+            # Simple substring search - for fuzzy search, install rapidfuzz
+            position = filename.find(query)
+            if position >= 0:
                 # Calculate a simple score based on match position and length
-                position = filename.find(query)
                 score = 100 - (position * 5)  # Higher score for matches at beginning
-                results.append((score, file_path, metadata))
+                results.append((score, file_path))
                 continue
             
             # Try to match individual words
-            query_parts = query.split()
-            match_count = 0
-            
-            for part in query_parts:
-                if part in filename:
-                    match_count += 1
+            match_count = sum(part in filename for part in query_parts)
             
             # If all parts match, add with score
-            if match_count == len(query_parts) and match_count > 0:
+            if match_count == part_count and match_count > 0:
                 score = 70 + (match_count * 5)  # Bonus for matching multiple parts
-                results.append((score, file_path, metadata))
+                results.append((score, file_path))
             # Partial matches if they're good enough
-            elif match_count > 0 and match_count >= len(query_parts) / 2:
+            elif match_count > 0 and match_count >= part_count / 2:
                 score = 50 + (match_count * 10)  # Lower score for partial matches
-                results.append((score, file_path, metadata))
+                results.append((score, file_path))
         
-        # Sort by score (highest first)
-        results.sort(reverse=True, key=lambda x: x[0])
+        # Only the top results are needed, so select them instead of sorting everything
+        return [item[1] for item in heapq.nlargest(limit, results, key=itemgetter(0))]
+    
+    def _filter_candidates(self, paths, names, locations, media_types):
+        """Keep only the search candidates under the given locations and of the given types.
         
-        # Return file paths for top results, limited to requested amount
-        return [item[1] for item in results[:limit]]
+        Args:
+            paths (list): Candidate file paths
+            names (list): Lowercased filenames, parallel to paths
+            locations (list): Directories to search under, or None for all
+            media_types (list): Extensions to search, with or without the dot, or None for all
+            
+        Returns:
+            tuple: (paths, names) lists for the candidates that passed
+        """
+        # Both checks are single startswith/endswith calls against prebuilt tuples
+        prefixes = tuple(os.path.join(os.path.abspath(location), '') for location in locations or ())
+        exts = tuple('.' + ext.lower().lstrip('.') for ext in media_types or ())
+        kept_paths, kept_names = [], []
+        for path, name in zip(paths, names):
+            if prefixes and not path.startswith(prefixes):
+                continue
+            if exts and not name.endswith(exts):
+                continue
+            kept_paths.append(path)
+            kept_names.append(name)
+        return kept_paths, kept_names
     
     def get_track_metadata(self, file_path):
         """Get metadata for a track from the index.
@@ -288,8 +687,23 @@ class MediaHandler:
             file_path (str): Path to the file
         """
         if file_path in self.media_index:
-            self.media_index[file_path]['last_played'] = datetime.now().isoformat()
+            self.media_index[file_path]['last_played'] = time.time()
             self.media_index[file_path]['play_count'] += 1
+            # Write-behind: mark the shard dirty and let the timer flush it
+            self._mark_dirty(file_path)
+            self._schedule_save()
+    
+    def _schedule_save(self):
+        """Arm a one-shot timer that flushes the index if it is still dirty."""
+        if self._save_timer is None:
+            self._save_timer = threading.Timer(self.save_interval, self._flush_index)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+    
+    def _flush_index(self):
+        """Timer callback: save the index if anything changed since the last save."""
+        self._save_timer = None
+        if self._dirty_shards:
             self._save_index()
     
     def load_media_from_directory(self, directory, recursive=False):
@@ -302,28 +716,121 @@ class MediaHandler:
         Returns:
             list: Paths to all media files found
         """
-        media_files = []
+        return [sys.intern(entry.path) for entry in self._scan_media(directory, recursive)]
+    
+    def load_media_from_directories(self, directories, recursive=False):
+        """Scan several directories for media files in one batched call.
         
-        if not os.path.exists(directory):
-            return media_files
+        Directory reads block on I/O (especially on network or USB mounts),
+        so the directories are scanned on a thread pool and overlap.
+        
+        Args:
+            directories (list): Directory paths to scan
+            recursive (bool): Whether to scan subdirectories
             
-        # Use pathlib for better path handling
-        root_dir = Path(directory)
+        Returns:
+            list: One list of (path, mtime, lowercased filename) tuples per
+            directory, in the same order as directories
+        """
+        if not directories:
+            return []
         
-        # Get the iterator (recursive or non-recursive)
-        if recursive:
-            file_iterator = root_dir.glob('**/*')  # Recursive
-        else:
-            file_iterator = root_dir.glob('*')  # Non-recursive
+        def scan(directory):
+            # Scan from the absolute path so track paths match the index keys
+            return list(self.iter_media(os.path.abspath(directory), recursive))
         
-        # Process each file
-        for file_path in file_iterator:
-            if file_path.is_file():
-                ext = file_path.suffix.lower()
-                if ext in self.all_supported:
-                    media_files.append(str(file_path))
+        with ThreadPoolExecutor(max_workers=min(8, len(directories))) as executor:
+            return list(executor.map(scan, directories))
+
+    def get_indexed_media(self, directories, recursive=False):
+        """List the indexed media under several directories without touching the disk.
+
+        Right after update_media_index the index matches what is on disk, so
+        this answers the same question as load_media_from_directories without
+        walking the library a second time.
+
+        Args:
+            directories (list): Directory paths to list
+            recursive (bool): Whether to include subdirectories
+
+        Returns:
+            list: One list of (path, mtime, lowercased filename) tuples per
+            directory, in the same order as directories
+        """
+        with self._index_lock:
+            items = list(self.media_index.items())
+
+        results = []
+        for directory in directories:
+            # Index keys are absolute, so match against the absolute path
+            directory = os.path.abspath(directory)
+            prefix = os.path.join(directory, '')
+            results.append([
+                (path, entry.get('mtime') or 0, entry['filename'].lower())
+                for path, entry in items
+                if (path.startswith(prefix) if recursive else entry.get('directory') == directory)
+            ])
+        return results
+
+    def iter_media(self, directory, recursive=False):
+        """Iterate over supported media files with the details needed to sort them.
+        
+        Args:
+            directory (str): Directory path to scan
+            recursive (bool): Whether to scan subdirectories
+            
+        Yields:
+            tuple: (path, mtime, lowercased filename) for each media file
+        """
+        for entry in self._scan_media(directory, recursive):
+            try:
+                mtime = entry.stat().st_mtime
+            except OSError:
+                continue  # Removed while scanning
+            yield sys.intern(entry.path), mtime, entry.name.lower()
+    
+    def _scan_media(self, directory, recursive):
+        """Yield a DirEntry for every supported media file under a directory.
         
-        return media_files
+        Walks with os.scandir; DirEntry caches file type info from the
+        directory read, so no extra stat call is needed per file. Symlinks
+        are followed; each directory is listed once, so symlink loops end
+        the walk.
+        """
+        if not os.path.exists(directory):
+            return
+        
+        audio_exts = self._audio_exts
+        visited = {self._directory_key(directory)}  # (st_dev, st_ino) of directories queued
+        pending = [directory]
+        while pending:
+            current_dir = pending.pop()
+            try:
+                with os.scandir(current_dir) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_file():
+                                if entry.name.lower().endswith(audio_exts):
+                                    yield entry
+                            elif recursive and entry.is_dir():
+                                stat = entry.stat()
+                                key = (stat.st_dev, stat.st_ino)
+                                if key not in visited:
+                                    visited.add(key)
+                                    pending.append(entry.path)
+                        except OSError:
+                            continue  # Removed while scanning
+            except OSError as e:
+                log.warning("Error scanning %s: %s", current_dir, e)
+    
+    @staticmethod
+    def _directory_key(directory):
+        """Identify a directory by (st_dev, st_ino) so symlinked repeats are listed once."""
+        try:
+            stat = os.stat(directory)
+        except OSError:
+            return directory  # Unreadable; scanning it will log the error
+        return stat.st_dev, stat.st_ino
     
     def convert_if_needed(self, file_path):
         """Convert non-pygame supported files to .wav format.
@@ -332,7 +839,8 @@ class MediaHandler:
             file_path (str): Path to the audio file
             
         Returns:
-            str: Path to a playable file (original or converted)
+            Union[str, io.BytesIO]: Path to a playable file (original or
+            previously converted), or an in-memory WAV buffer
         """
         ext = os.path.splitext(file_path)[1].lower()
         
@@ -340,31 +848,110 @@ class MediaHandler:
         if ext in self.pygame_supported:
             return file_path
             
-        # Check if we've already converted this file
-        if file_path in self.converted_files:
-            return self.converted_files[file_path]
+        # Reuse a conversion from this or an earlier session if the source is unchanged.
+        # Temporary downloads would only leave a WAV behind that is never reused
+        cache_file = None
+        if not self._is_temporary_source(file_path):
+            try:
+                cache_file = self._converted_cache_path(file_path)
+            except OSError as e:
+                log.error("Error converting %s: %s", file_path, e)
+                return None
+            if os.path.exists(cache_file):
+                self.converted_files[file_path] = cache_file
+                try:
+                    os.utime(cache_file)  # Mark as recently used for pruning
+                except OSError:
+                    pass
+                return cache_file
         
         try:
-            # Load the audio file using pydub
-            if ext in ['.m4a', '.aac', '.mp4']:
-                sound = AudioSegment.from_file(file_path, format="m4a")
-            elif ext == '.flac':
-                sound = AudioSegment.from_file(file_path, format="flac")
-            elif ext == '.wma':
-                sound = AudioSegment.from_file(file_path, format="wma")
-            else:
-                sound = AudioSegment.from_file(file_path)
-            
-            # Create a temporary WAV file
-            temp_file = os.path.join(self.temp_dir, os.path.basename(file_path) + '.wav')
-            sound.export(temp_file, format="wav")
-            
-            self.converted_files[file_path] = temp_file
-            return temp_file
+            # Decode straight into memory through ffmpeg's stdout pipe so no
+            # temp WAV has to be written and read back; ffmpeg detects the
+            # input container itself, so no per-format handling
+            raw, _ = (
+                ffmpeg
+                .input(file_path)
+                .output('pipe:', format='wav', acodec='pcm_s16le', ar=44100, ac=2)
+                .run(capture_stdout=True, capture_stderr=True)
+            )
+            # Persist for later sessions off the playback path
+            if cache_file:
+                threading.Thread(
+                    target=self._store_converted,
+                    args=(file_path, cache_file, raw),
+                    daemon=True
+                ).start()
+            return io.BytesIO(raw)
         except Exception as e:
-            print(f"Error converting file: {e}")
+            log.error("Error converting %s: %s", file_path, e)
             return None
 
+    def _is_temporary_source(self, file_path):
+        """Check whether a file lives in a temporary directory (ours or the system's)."""
+        return os.path.realpath(file_path).startswith(self._temp_roots)
+    
+    def _converted_cache_path(self, file_path):
+        """Get the cache path for a converted file.
+        
+        The name hashes the source path, modification time and size, so an
+        edited or replaced source never maps to a stale conversion.
+        """
+        stat = os.stat(file_path)
+        key = f"{file_path}|{stat.st_mtime_ns}|{stat.st_size}"
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=12).hexdigest()
+        return os.path.join(self.cache_dir, digest + '.wav')
+    
+    def _store_converted(self, file_path, cache_file, raw):
+        """Write converted WAV data to the conversion cache.
+        
+        The data is written to a .part file and renamed into place, so a crash
+        mid-write never leaves a truncated file under the final cache name.
+        """
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            part_file = cache_file + '.part'
+            with open(part_file, 'wb') as f:
+                f.write(raw)
+            os.replace(part_file, cache_file)
+            self.converted_files[file_path] = cache_file
+            self._prune_converted_cache()
+        except Exception as e:
+            log.warning("Error caching converted file: %s", e)
+    
+    def _prune_converted_cache(self):
+        """Delete the least recently used conversions until the cache fits cache_max_bytes.
+        
+        Cache hits touch their file's mtime, so the oldest mtime is the least
+        recently used conversion.
+        """
+        files = []
+        try:
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    if entry.name.endswith('.wav') and entry.is_file():
+                        stat = entry.stat()
+                        files.append((stat.st_mtime, stat.st_size, entry.path))
+        except OSError:
+            return
+        total = sum(size for _, size, _ in files)
+        if total <= self.cache_max_bytes:
+            return
+        
+        pruned = set()
+        for _, size, path in sorted(files):
+            if total <= self.cache_max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            pruned.add(path)
+        if pruned:
+            self.converted_files = {src: dst for src, dst in self.converted_files.items()
+                                    if dst not in pruned}
+
     def convert_to_mp3(self, input_file, output_file):
         """Convert an audio file to MP3 format using ffmpeg"""
         try:
@@ -377,87 +964,249 @@ class MediaHandler:
             )
             return True
         except Exception as e:
-            print(f"Error converting audio: {e}")
+            log.error("Error converting audio: %s", e)
             return False
     
-    def get_track_duration(self, file_path):
+    def get_track_duration(self, file_path, use_index=True):
         """Get the duration of an audio track in seconds.
         
+        Only container headers are read; the audio itself is never decoded.
+        
+        Args:
+            file_path (str): Path to the audio file
+            use_index (bool): Return the indexed duration if there is one
+            
+        Returns:
+            float: Duration in seconds (180 if it can't be determined)
+        """
+        # The index already stores durations; only probe files it doesn't know
+        if use_index:
+            cached = self.get_duration_from_index(file_path)
+            if cached:
+                return cached
+        
+        return self._probe_duration(file_path) or 180  # Default 3 minutes
+    
+    def get_duration_from_index(self, file_path):
+        """Get a track's indexed duration without touching the file.
+        
         Args:
             file_path (str): Path to the audio file
             
         Returns:
-            float: Duration in seconds
+            float: Duration in seconds, or None if the track isn't indexed
+        """
+        entry = self.media_index.get(file_path)
+        return entry.get('duration') if entry else None
+    
+    def _probe_duration(self, file_path):
+        """Read a track's duration from its container headers.
+        
+        Returns:
+            float: Duration in seconds, or None if every probe failed
         """
         try:
-            # Try using pydub first (more reliable)
+            ext = os.path.splitext(file_path)[1].lower()
+            
+            # WAV: frame count and rate come straight from the RIFF header
+            if ext == '.wav':
+                try:
+                    with wave.open(file_path, 'rb') as wav:
+                        return wav.getnframes() / wav.getframerate()
+                except Exception as e:
+                    log.debug("Wave error: %s", e)
+            
+            # TinyTag parses mp3/ogg/flac headers in-process, no subprocess needed
+            if ext in ('.mp3', '.ogg', '.flac', '.wav'):
+                try:
+                    duration = TinyTag.get(file_path).duration
+                    if duration:
+                        return duration
+                except Exception as e:
+                    log.debug("TinyTag error: %s", e)
+            
+            # ffprobe reads the container header for everything else
             try:
-                audio = AudioSegment.from_file(file_path)
-                return len(audio) / 1000  # Convert from ms to seconds
+                probe = ffmpeg.probe(file_path)
+                return float(probe['format']['duration'])
             except Exception as e:
-                print(f"Pydub error: {e}")
-                
-                # Fallback to pygame for supported formats
-                ext = os.path.splitext(file_path)[1].lower()
-                if ext in self.pygame_supported:
-                    try:
-                        sound = pygame.mixer.Sound(file_path)
-                        return sound.get_length()
-                    except Exception as e:
-                        print(f"Pygame error: {e}")
-                
-                # Default duration
-                return 180  # 3 minutes
+                log.debug("FFprobe error: %s", e)
+            
+            return None
         except Exception as e:
-            print(f"Duration detection error: {e}")
-            return 180  # Default 3 minutes
+            log.warning("Duration detection error for %s: %s", file_path, e)
+            return None
+    
+    def _shard_for(self, file_path):
+        """Get the shard number a path is stored in (stable across runs)."""
+        return zlib.crc32(file_path.encode('utf-8')) % self.index_shards
+    
+    def _mark_dirty(self, file_path):
+        """Mark the shard holding a path as needing to be written."""
+        self._dirty_shards.add(self._shard_for(file_path))
+    
+    def _read_json(self, path):
+        """Read a JSON file, using orjson when available."""
+        with open(path, 'rb') as f:
+            raw = f.read()
+        return orjson.loads(raw) if orjson else json.loads(raw)
+    
+    def _write_json(self, path, data):
+        """Write a JSON file atomically, using orjson when available.
+        
+        The data goes to a temporary file in the same directory that is then
+        renamed over the target, so a crash mid-save leaves the previous file
+        intact. Each write gets its own temporary file, so concurrent writers
+        never share one.
+        """
+        directory, name = os.path.split(path)
+        f = tempfile.NamedTemporaryFile('wb' if orjson else 'w', dir=directory or '.',
+                                        prefix=name + '.', suffix='.part', delete=False)
+        try:
+            with f:
+                if orjson:
+                    f.write(orjson.dumps(data))
+                else:
+                    json.dump(data, f)
+            os.replace(f.name, path)
+        except BaseException:
+            # Don't leave a half-written temporary file behind
+            try:
+                os.remove(f.name)
+            except OSError:
+                pass
+            raise
     
     def _load_index(self):
-        """Load the index from disk or create it if it doesn't exist."""
+        """Load the index from disk or create it if it doesn't exist.
+        
+        The index is stored as a manifest plus one JSON file per shard. A
+        single-file index from older versions is migrated on first load.
+        """
         try:
-            if os.path.exists(self.index_file):
-                with open(self.index_file, 'r') as f:
-                    data = json.load(f)
-                    self.media_index = data.get('index', {})
-                    self.media_locations = data.get('locations', [])
-                    self.last_update = data.get('last_update')
+            manifest_path = os.path.join(self.index_dir, 'manifest.json')
+            if os.path.exists(manifest_path):
+                manifest = self._read_json(manifest_path)
+                self.media_locations = manifest.get('locations', [])
+                self.last_update = manifest.get('last_update')
+                self.converted_files = {
+                    src: dst for src, dst in manifest.get('converted', {}).items()
+                    if os.path.exists(dst)
+                }
+                
+                # Union-merge every shard file into one index
+                self.media_index = {}
+                for shard in range(manifest.get('shards', self.index_shards)):
+                    shard_path = os.path.join(self.index_dir, f"shard_{shard:02d}.json")
+                    if os.path.exists(shard_path):
+                        self.media_index.update(self._read_json(shard_path))
+                
+                # Re-shard everything if the shard count changed
+                if manifest.get('shards', self.index_shards) != self.index_shards:
+                    self._dirty_shards = set(range(self.index_shards))
+            elif os.path.exists(self.legacy_index_file):
+                data = self._read_json(self.legacy_index_file)
+                self.media_index = data.get('index', {})
+                self.media_locations = data.get('locations', [])
+                self.last_update = data.get('last_update')
+                # Write every shard once to migrate to the sharded layout
+                self._dirty_shards = set(range(self.index_shards))
+                self._save_index()
+                log.info("Migrated %s to %s", self.legacy_index_file, self.index_dir)
             else:
                 # Initialize empty data structures
                 self.media_index = {}
                 self.last_update = None
-                # Create the file with empty data
+                # Create the index directory with an empty manifest
                 self._save_index()
-                print(f"Created new index file: {self.index_file}")
+                log.info("Created new index directory: %s", self.index_dir)
         except Exception as e:
-            print(f"Error loading/creating index: {e}")
+            log.error("Error loading/creating index: %s", e)
             # Initialize empty if loading fails
             self.media_index = {}
             self.last_update = None
+        
+        self._locations_tuple = None
+        self._migrate_timestamps()
+        self._intern_index_paths()
+        self._rebuild_index_views()
+    
+    def _intern_index_paths(self):
+        """Intern the path strings of a freshly loaded index.
+        
+        Scans intern the paths they find, so the index, the sorted views and
+        the player's playlist all share one string per track. Hashing and
+        comparing an interned path is then an identity check, and shared
+        directory names are stored once instead of once per file.
+        """
+        interned = {}
+        for file_path, entry in self.media_index.items():
+            file_path = sys.intern(file_path)
+            entry['path'] = file_path
+            if entry.get('directory'):
+                entry['directory'] = sys.intern(entry['directory'])
+            interned[file_path] = entry
+        self.media_index = interned
+    
+    def _migrate_timestamps(self):
+        """Convert ISO date strings from older indexes to POSIX timestamps."""
+        for file_path, entry in self.media_index.items():
+            for field in ('added_on', 'last_played'):
+                value = entry.get(field)
+                if isinstance(value, str):
+                    try:
+                        entry[field] = datetime.fromisoformat(value).timestamp()
+                    except ValueError:
+                        entry[field] = None
+                    self._mark_dirty(file_path)
     
     def _save_index(self):
-        """Save the index to disk."""
-        try:
-            data = {
-                'index': self.media_index,
-                'locations': self.media_locations,
-                'last_update': self.last_update
-            }
-            with open(self.index_file, 'w') as f:
-                json.dump(data, f)
-        except Exception as e:
-            print(f"Error saving index: {e}")
+        """Save the index to disk.
+        
+        Only shards with entries changed since the last save are rewritten;
+        the small manifest is always written. Saves come from the write-behind
+        timer, the main thread and the library worker, so the whole save runs
+        under _save_lock. If it fails, the shards it took are marked dirty
+        again so the next save retries them.
+        """
+        with self._save_lock:
+            dirty_shards, self._dirty_shards = self._dirty_shards, set()
+            try:
+                os.makedirs(self.index_dir, exist_ok=True)
+                
+                if dirty_shards:
+                    shards = {shard: {} for shard in dirty_shards}
+                    with self._index_lock:
+                        items = list(self.media_index.items())
+                    for file_path, metadata in items:
+                        shard = self._shard_for(file_path)
+                        if shard in shards:
+                            shards[shard][file_path] = metadata
+                    for shard, entries in shards.items():
+                        shard_path = os.path.join(self.index_dir, f"shard_{shard:02d}.json")
+                        self._write_json(shard_path, entries)
+                
+                self._write_json(os.path.join(self.index_dir, 'manifest.json'), {
+                    'locations': self.media_locations,
+                    'last_update': self.last_update,
+                    'converted': self.converted_files,
+                    'shards': self.index_shards
+                })
+            except Exception as e:
+                self._dirty_shards.update(dirty_shards)
+                log.error("Error saving index: %s", e)
     
     def cleanup(self):
         """Clean up temporary files."""
-        # Save index before cleanup
+        # Cancel any pending write-behind and save the index before cleanup
+        if self._save_timer is not None:
+            self._save_timer.cancel()
+            self._save_timer = None
+        # Converted files are kept in the persistent cache for later sessions,
+        # trimmed to cache_max_bytes. Pruning first keeps the saved manifest accurate
+        self._prune_converted_cache()
         self._save_index()
         
-        # Clean up converted files
-        for temp_file in self.converted_files.values():
-            try:
-                os.remove(temp_file)
-            except:
-                pass
         try:
             os.rmdir(self.temp_dir)
         except:
@@ -481,7 +1230,7 @@ class MediaHandler:
             # Convert file if needed
             playable_file = self.convert_if_needed(file_path)
             if not playable_file:
-                print(f"Cannot play {os.path.basename(file_path)}: format not supported")
+                log.warning("Cannot play %s: format not supported", file_path)
                 # Publish failure event if event bus is available
                 if self.event_bus:
                     self.event_bus.publish('media_play_failed', {
@@ -490,8 +1239,12 @@ class MediaHandler:
                     })
                 return False, None
             
-            # Load and play the file
-            pygame.mixer.music.load(playable_file)
+            # Load and play the file (in-memory buffers need a format hint)
+            self._ensure_mixer()
+            if isinstance(playable_file, io.BytesIO):
+                pygame.mixer.music.load(playable_file, 'wav')
+            else:
+                pygame.mixer.music.load(playable_file)
             pygame.mixer.music.play(loops, start_pos)
             
             # Publish play event if event bus is available
@@ -502,11 +1255,11 @@ class MediaHandler:
                     'start_position': start_pos
                 })
             
-            # Return success and temp file path if one was created
-            temp_file = playable_file if playable_file != file_path else None
-            return True, temp_file
+            # Conversions live in the persistent cache, so there is never a
+            # temp file for the caller to clean up
+            return True, None
         except Exception as e:
-            print(f"Error playing audio: {e}")
+            log.error("Error playing audio: %s", e)
             # Publish error event if event bus is available
             if self.event_bus:
                 self.event_bus.publish('media_play_error', {
@@ -515,6 +1268,13 @@ class MediaHandler:
                 })
             return False, None
 
+    def _ensure_mixer(self):
+        """Initialize the pygame mixer the first time audio is played."""
+        if not self._mixer_ready:
+            if not pygame.mixer.get_init():
+                pygame.mixer.init(frequency=44100)
+            self._mixer_ready = True
+
     def pause_audio(self):
         """
         Pause audio playback.
@@ -529,7 +1289,7 @@ class MediaHandler:
                 self.event_bus.publish('media_paused', {})
             return True
         except Exception as e:
-            print(f"Error pausing audio: {e}")
+            log.error("Error pausing audio: %s", e)
             # Publish error event if event bus is available
             if self.event_bus:
                 self.event_bus.publish('media_pause_error', {
@@ -551,7 +1311,7 @@ class MediaHandler:
                 self.event_bus.publish('media_resumed', {})
             return True
         except Exception as e:
-            print(f"Error resuming audio: {e}")
+            log.error("Error resuming audio: %s", e)
             # Publish error event if event bus is available
             if self.event_bus:
                 self.event_bus.publish('media_resume_error', {
@@ -570,7 +1330,7 @@ class MediaHandler:
                 # Already stopped or never initialized
                 return True
         except Exception as e:
-            print(f"Error stopping audio: {e}")
+            log.error("Error stopping audio: %s", e)
             return False
 
     def set_audio_volume(self, volume):
@@ -593,7 +1353,7 @@ class MediaHandler:
                 })
             return True
         except Exception as e:
-            print(f"Error setting volume: {e}")
+            log.error("Error setting volume: %s", e)
             # Publish error event if event bus is available
             if self.event_bus:
                 self.event_bus.publish('media_volume_error', {
@@ -622,7 +1382,7 @@ class MediaHandler:
                 return pos_seconds
             return -1
         except Exception as e:
-            print(f"Error reporting position: {e}")
+            log.debug("Error reporting position: %s", e)
             return -1
     
     def check_playback_ended(self):
@@ -632,7 +1392,7 @@ class MediaHandler:
         Returns:
             bool: True if playback has ended
         """
-        if not self.event_bus:
+        if not self.event_bus or not pygame.mixer.get_init():
             return False
             
         if not pygame.mixer.music.get_busy():
@@ -650,7 +1410,7 @@ class MediaHandler:
         try:
             return pygame.mixer.music.get_busy()
         except Exception as e:
-            print(f"Error checking playback status: {e}")
+            log.debug("Error checking playback status: %s", e)
             return False
 
     def get_audio_position(self):
@@ -663,7 +1423,7 @@ class MediaHandler:
         try:
             return pygame.mixer.music.get_pos()
         except Exception as e:
-            print(f"Error getting position: {e}")
+            log.debug("Error getting position: %s", e)
             return -1
             
     def cleanup_audio_file(self, file_path):
@@ -685,17 +1445,47 @@ class MediaHandler:
                         del self.converted_files[src]
                 return True
             except Exception as e:
-                print(f"Error removing temp file: {e}")
+                log.debug("Error removing temp file: %s", e)
                 return False
         return True  # No file to clean up
     
+    def _http_session(self):
+        """Get the shared requests session, creating it on first use."""
+        if self._http is None:
+            import requests
+            self._http = requests.Session()
+        return self._http
+    
     def download_media_file(self, url, file_name, download_dir=None):
         if not download_dir:
             download_dir=self.temp_dir 
         try:
             file_path = os.path.join(download_dir, file_name)
             if not os.path.exists(file_path):
-                urllib.request.urlretrieve(url, file_path)
+                # Download to a .part file, resuming a previous partial download
+                part_path = file_path + '.part'
+                offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+                headers = {'Range': f'bytes={offset}-'} if offset else {}
+                
+                with self._http_session().get(url, stream=True, headers=headers, timeout=30) as response:
+                    response.raise_for_status()
+                    if offset and response.status_code != 206:
+                        offset = 0  # Server ignored the range, start over
+                    response.raw.decode_content = True
+                    size = int(response.headers.get('Content-Length', 0))
+                    
+                    with open(part_path, 'r+b' if offset else 'wb') as f:
+                        f.seek(offset)
+                        # Reserve the space up front to avoid fragmenting the file
+                        if size and hasattr(os, 'posix_fallocate'):
+                            try:
+                                os.posix_fallocate(f.fileno(), offset, size)
+                            except OSError:
+                                pass
+                        shutil.copyfileobj(response.raw, f, length=1024 * 1024)
+                        f.truncate()
+                
+                os.replace(part_path, file_path)
             return file_path
         except Exception as e:
-            print(f"Error downloading {file_name}: {e}")
\ No newline at end of file
+            log.error("Error downloading %s: %s", file_name, e)
\ No newline at end of file
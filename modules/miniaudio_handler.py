@@ -0,0 +1,252 @@
+# modules/miniaudio_handler.py
+import io
+import os
+import array
+import threading
+import warnings
+import pygame
+import miniaudio
+# audioop scales whole sample buffers in C. It is deprecated in 3.12 and
+# comes from the audioop-lts package on 3.13+ (part of the miniaudio extra)
+with warnings.catch_warnings():
+    warnings.simplefilter("ignore", DeprecationWarning)
+    import audioop
+from modules.media_handler import MediaHandler
+from modules.logging_utils import app_logger as log
+
+
+class MiniaudioHandler(MediaHandler):
+    """MediaHandler that plays audio through miniaudio instead of pygame.mixer.music.
+
+    miniaudio opens the output device directly, so playback starts without
+    SDL_mixer's buffer chain, and the position comes from the number of
+    frames actually handed to the device rather than get_pos().
+    Indexing, conversion and metadata are inherited unchanged.
+    """
+
+    SAMPLE_RATE = 44100
+    CHANNELS = 2
+    uses_pygame_mixer = False  # miniaudio owns the output device
+
+    def __init__(self, end_event=None):
+        """Initialize the handler.
+
+        Args:
+            end_event (int, optional): pygame event type to post when a track ends
+        """
+        super().__init__()
+        # Formats miniaudio decodes itself; everything else goes through ffmpeg
+        self.miniaudio_supported = ['.mp3', '.wav', '.flac', '.ogg']
+        self.end_event = end_event
+        self._device = None
+        self._stream = None
+        self._frames_played = 0
+        self._playing = False
+        self._volume = 1.0
+        self._lock = threading.Lock()
+
+    def _open_stream(self, file_path, start_pos):
+        """Open a decoded sample stream for a file, starting at start_pos seconds."""
+        seek_frame = int(start_pos * self.SAMPLE_RATE)
+        stream_args = dict(output_format=miniaudio.SampleFormat.SIGNED16,
+                           nchannels=self.CHANNELS, sample_rate=self.SAMPLE_RATE,
+                           seek_frame=seek_frame)
+
+        if os.path.splitext(file_path)[1].lower() in self.miniaudio_supported:
+            return miniaudio.stream_file(file_path, **stream_args)
+
+        playable_file = self.convert_if_needed(file_path)
+        if not playable_file:
+            return None
+        if isinstance(playable_file, io.BytesIO):
+            return miniaudio.stream_memory(playable_file.getvalue(), **stream_args)
+        return miniaudio.stream_file(playable_file, **stream_args)
+
+    def _on_progress(self, frames):
+        """Count the frames handed to the device for get_audio_position."""
+        self._frames_played += frames
+
+    def _apply_volume(self, samples):
+        """Scale a chunk of samples by the current volume.
+        
+        Runs on the device's real-time callback, so the whole chunk is
+        scaled in one C call instead of a Python loop per sample.
+        """
+        volume = self._volume
+        if volume >= 1.0:
+            return samples
+        return array.array(samples.typecode, audioop.mul(samples, samples.itemsize, volume))
+
+    def _on_end(self):
+        """Mark playback finished and tell the player's event loop."""
+        self._playing = False
+        if self.end_event is not None:
+            try:
+                pygame.event.post(pygame.event.Event(self.end_event))
+            except pygame.error as e:
+                log.debug("Could not post the end event: %s", e)
+        if self.event_bus:
+            self.event_bus.publish('media_playback_ended', {})
+
+    def play_audio(self, file_path, start_pos=0.0, loops=0):
+        """
+        Load and play an audio file.
+
+        Args:
+            file_path (str): Path to the audio file
+            start_pos (float): Start position in seconds
+            loops (int): Unused; kept for interface compatibility
+
+        Returns:
+            tuple: (success, None)
+        """
+        try:
+            stream = self._open_stream(file_path, start_pos)
+            if stream is None:
+                log.warning("Cannot play %s: format not supported", file_path)
+                if self.event_bus:
+                    self.event_bus.publish('media_play_failed', {
+                        'file_path': file_path,
+                        'reason': 'format_not_supported'
+                    })
+                return False, None
+
+            stream = miniaudio.stream_with_callbacks(
+                stream,
+                progress_callback=self._on_progress,
+                frame_process_method=self._apply_volume,
+                end_callback=self._on_end
+            )
+            next(stream)  # Prime the generator before handing it to the device
+
+            with self._lock:
+                self._close_device()
+                self._device = miniaudio.PlaybackDevice(
+                    output_format=miniaudio.SampleFormat.SIGNED16,
+                    nchannels=self.CHANNELS, sample_rate=self.SAMPLE_RATE
+                )
+                self._stream = stream
+                self._frames_played = 0
+                self._playing = True
+                self._device.start(stream)
+
+            if self.event_bus:
+                self.event_bus.publish('media_play_started', {
+                    'file_path': file_path,
+                    'playable_file': file_path,
+                    'start_position': start_pos
+                })
+            return True, None
+        except Exception as e:
+            log.error("Error playing audio: %s", e)
+            if self.event_bus:
+                self.event_bus.publish('media_play_error', {
+                    'file_path': file_path,
+                    'error': str(e)
+                })
+            return False, None
+
+    def _close_device(self):
+        """Stop and release the current playback device, if any."""
+        if self._device is not None:
+            self._device.close()
+            self._device = None
+            self._stream = None
+
+    def pause_audio(self):
+        """
+        Pause audio playback.
+
+        Returns:
+            bool: True if successful
+        """
+        try:
+            with self._lock:
+                if self._device is not None:
+                    self._device.stop()
+                self._playing = False
+            if self.event_bus:
+                self.event_bus.publish('media_paused', {})
+            return True
+        except Exception as e:
+            log.error("Error pausing audio: %s", e)
+            return False
+
+    def resume_audio(self):
+        """
+        Resume paused audio playback.
+
+        Returns:
+            bool: True if successful
+        """
+        try:
+            with self._lock:
+                if self._device is not None and self._stream is not None:
+                    self._playing = True
+                    self._device.start(self._stream)
+            if self.event_bus:
+                self.event_bus.publish('media_resumed', {})
+            return True
+        except Exception as e:
+            log.error("Error resuming audio: %s", e)
+            return False
+
+    def stop_audio(self):
+        """Stop audio playback."""
+        try:
+            with self._lock:
+                self._playing = False
+                self._close_device()
+            return True
+        except Exception as e:
+            log.error("Error stopping audio: %s", e)
+            return False
+
+    def set_audio_volume(self, volume):
+        """
+        Set audio volume (0.0 to 1.0).
+
+        Args:
+            volume (float): Volume level between 0.0 and 1.0
+
+        Returns:
+            bool: True if successful
+        """
+        self._volume = max(0.0, min(1.0, volume))
+        if self.event_bus:
+            self.event_bus.publish('media_volume_changed', {
+                'volume': self._volume
+            })
+        return True
+
+    def check_playback_ended(self):
+        """
+        Check if playback has ended and publish an event if it has.
+
+        Returns:
+            bool: True if playback has ended
+        """
+        return self.event_bus is not None and not self._playing
+
+    def is_audio_playing(self):
+        """
+        Check if audio is currently playing.
+
+        Returns:
+            bool: True if audio is playing
+        """
+        return self._playing
+
+    def get_audio_position(self):
+        """
+        Get current playback position in milliseconds.
+
+        Returns:
+            int: Position in milliseconds since playback started
+        """
+        return int(self._frames_played * 1000 / self.SAMPLE_RATE)
+
+    def cleanup(self):
+        """Release the playback device and clean up temporary files."""
+        self.stop_audio()
+        super().cleanup()
@@ -1,12 +1,17 @@
 #Player
 import os
+import sys
 os.environ['PYGAME_HIDE_SUPPORT_PROMPT'] = '1'
 import time
 import threading
 import pygame
 import random
 from enum import Enum
-from typing import Dict, List, Callable, Any
+from contextlib import contextmanager
+from collections import OrderedDict
+from operator import itemgetter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple, Callable, Any
 from modules.media_handler import MediaHandler
 from modules.playlist_handler import PlaylistHandler
 from modules.plugin_manager import PluginManager
@@ -14,20 +19,33 @@ from modules.plugin_manager import PluginManager
 from modules.logging_utils import log_function_call, app_logger as log
 
 class EventBus:
+    MAX_PENDING = 1024  # Callbacks allowed to queue before new ones are dropped
+    
     def __init__(self):
-        self._listeners: Dict[str, List[Callable]] = {}
+        # Listener tuples are replaced, never mutated, so publish can read them
+        # without the lock; the lock only serializes subscribe/unsubscribe
+        self._listeners: Dict[str, Tuple[Callable, ...]] = {}
         self._lock = threading.Lock()
+        # Callbacks run on a small pool instead of a new thread each
+        self._executor = ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 2),
+                                            thread_name_prefix="evbus")
+        # Bounds the executor queue so a stuck listener can't grow it forever
+        self._pending = threading.BoundedSemaphore(self.MAX_PENDING)
+        self._sync_mode = False  # After shutdown(), callbacks run on the publishing thread
     
     def subscribe(self, event_type: str, callback: Callable) -> None:
         with self._lock:
-            if event_type not in self._listeners:
-                self._listeners[event_type] = []
-            self._listeners[event_type].append(callback)
+            listeners = self._listeners.get(event_type, ())
+            # Plugins and the plugin manager may both subscribe the same bound
+            # method; keep one copy so it isn't dispatched twice
+            if callback not in listeners:
+                self._listeners[event_type] = listeners + (callback,)
     
     def unsubscribe(self, event_type: str, callback: Callable) -> bool:
         with self._lock:
-            if event_type in self._listeners and callback in self._listeners[event_type]:
-                self._listeners[event_type].remove(callback)
+            listeners = self._listeners.get(event_type, ())
+            if callback in listeners:
+                self._listeners[event_type] = tuple(l for l in listeners if l != callback)
                 return True
             return False
     
@@ -36,24 +54,56 @@ class EventBus:
         callback_args = callback_args or ()
         callback_kwargs = callback_kwargs or {}
             
-        with self._lock:
-            if event_type in self._listeners:
-                for listener in self._listeners[event_type]:
-                    threading.Thread(
-                        target=self._safe_callback_execution,
-                        args=(listener, data)
-                    ).start()
+        # A single dict read gives a consistent snapshot; no lock needed
+        listeners = self._listeners.get(event_type, ())
+        for listener in listeners:
+            self._submit(self._safe_callback_execution, listener, data)
                     
         if callback:
-            threading.Thread(
-                target=lambda: callback(*callback_args, **callback_kwargs)
-            ).start()
+            self._submit(lambda: callback(*callback_args, **callback_kwargs))
+    
+    def _submit(self, fn, *args):
+        """Queue a call on the executor, dropping it if the queue is full."""
+        if self._sync_mode:
+            # Shutting down: run inline so the call finishes before teardown
+            try:
+                fn(*args)
+            except Exception:
+                log.exception("Error in event callback")
+            return
+        if not self._pending.acquire(blocking=False):
+            log.warning("Event queue full; dropping a callback")
+            return
+        try:
+            self._executor.submit(self._run_pending, fn, *args)
+        except RuntimeError:
+            # The executor has been shut down
+            self._pending.release()
+    
+    def _run_pending(self, fn, *args):
+        """Run a queued call and free its queue slot."""
+        try:
+            fn(*args)
+        except Exception:
+            # The executor would otherwise hold the error in an unread future
+            log.exception("Error in event callback")
+        finally:
+            self._pending.release()
+    
+    def shutdown(self):
+        """Switch to synchronous dispatch and stop the worker pool.
+        
+        Callbacks already queued still run on the pool; anything published
+        afterwards runs inline on the publishing thread.
+        """
+        self._sync_mode = True
+        self._executor.shutdown(wait=False)
     
     def _safe_callback_execution(self, callback, data):
         try:
             callback(data)
-        except Exception as e:
-            print(f"Error in event callback: {e}")
+        except Exception:
+            log.exception("Error in event callback")
 
 class PlayerState(Enum):
     STOPPED = 0
@@ -64,10 +114,11 @@ def clear_screen():
     # For Windows
     if os.name == 'nt':
         os.system('cls')
-    # For Mac and Linux
+    # For Mac and Linux: write the same escape sequence `clear` prints
+    # (home, clear screen, clear scrollback) instead of spawning a process
     else:
-        os.system('clear')
-clear_screen()
+        sys.stdout.write('\x1b[H\x1b[2J\x1b[3J')
+        sys.stdout.flush()
 
 class MusicPlayer:
     """Core music player functionality"""   
@@ -75,7 +126,15 @@ class MusicPlayer:
     SOURCE_CHANGED = 'source_changed'
     TRACK_CHANGED = 'track_changed'
     POSITION_CHANGED = 'position_changed'
-    VOLUME_CHANGED = 'volume_changed'          
+    VOLUME_CHANGED = 'volume_changed'
+    NOTIFY_DELAY = 0.05  # Seconds playlist changes are coalesced before plugins hear of them
+    META_CACHE_SIZE = 64  # Tracks whose tag metadata is kept in memory
+    PLUGIN_ACTIONS = ('pause', 'stop', 'next', 'prev')  # Controls forwarded to the active plugin
+    STATE_MAP = {
+        'PLAYING': PlayerState.PLAYING,
+        'PAUSED': PlayerState.PAUSED,
+        'STOPPED': PlayerState.STOPPED
+    }
     def __init__(self, env):
         """Initialize the music player"""
         self.MUSIC_LIBRARY_PATH = env("MUSIC_LIBRARY_PATH", default=None)
@@ -85,15 +144,36 @@ class MusicPlayer:
         self.PLAYLISTS_PATH = env("PLAYLISTS_PATH", default="playlists")
         self.PLUGINS_PATH = env("PLUGINS_PATH", default="plugins")
         self.env = env
+        # A larger mixer buffer means fewer refill callbacks and no underruns
+        # under load; LOW_LATENCY trades that back for a quicker response
+        self.MIXER_BUFFER = 1024 if env.bool("LOW_LATENCY", default=False) else env.int("MIXER_BUFFER", default=4096)
+        # pre_init only applies if it runs before the mixer is initialized
+        pygame.mixer.pre_init(44100, -16, 2, self.MIXER_BUFFER)
         self.event_bus = EventBus()
-        self.media_handler = MediaHandler()  
-        pygame.init()  # Only initialize other pygame components
+        # pygame posts this event when a track finishes, so the event thread
+        # can sleep until then instead of polling the mixer
+        self.END_EVENT = pygame.USEREVENT + 1
+        self.AUDIO_BACKEND = env("AUDIO_BACKEND", default="pygame").lower()
+        self.media_handler = self._create_media_handler()
+        self._init_pygame()
         
         # Player state
         self.state = PlayerState.STOPPED
         self.current_track = None
         self.media = []
+        self._media_set = {}  # Ordered set of the paths in self.media, for O(1) dedup
+        self._mtime = {}  # Track path -> mtime from the last directory scan
         self.playlist = []
+        self._playlist_tuple = None  # Read-only snapshot for plugins, rebuilt after changes
+        self._playlist_version = 0  # Bumped each time a new snapshot is built
+        # Playlist notifications are coalesced so a burst of changes reaches plugins once
+        self._notify_lock = threading.Lock()
+        self._notify_pending = None  # Net delta waiting to be published
+        self._notify_timer = None  # Pending flush of _notify_pending
+        self._batch_depth = 0  # Nesting depth of batch_updates()
+        self._playlist_index = {}  # Track path -> first position in self.playlist; None when stale (see _positions)
+        # Guards the playlist, its index and current_index; library scans merge from a worker thread
+        self._playlist_lock = threading.RLock()
         self.current_index = 0
         self.current_playlist_name = None
         self.playback_info = {
@@ -117,7 +197,12 @@ class MusicPlayer:
         
         # Track playback details
         self.current_track_length = 0
-        self.track_start_time = 0
+        self.track_start_time = 0  # time.monotonic_ns() when the track started
+        self._last_position_query = 0  # monotonic_ns() when the mixer position was last read
+        self._meta_cache = OrderedDict()  # Track path -> metadata, least recently used first
+        self._track_meta_loaded = None  # Track whose tags are already in playback_info
+        self._library_executor = None  # Runs background library refreshes
+        self._library_lock = threading.RLock()  # Serializes library rescans
         
         # Initialize other handlers
         self.playlist_handler = PlaylistHandler(playlists_dir=self.PLAYLISTS_PATH)
@@ -133,15 +218,25 @@ class MusicPlayer:
         self.plugins_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), self.PLUGINS_PATH)
         self.available_plugins = self.plugin_manager.scan_plugin_directory(self.plugins_dir)
         # log.info("load plugins")
-        # Load enabled plugins if auto-load is enabled
         self.plugins = {}
-        if self.plugin_manager.settings['auto_load_plugins']:
-            self.load_plugins()
+        self._plugin_methods = {}  # Plugin name -> {action: bound method or None}
+        self._plugin_loader = None
         
         # Event handling thread
         self.running = True
         self.shuffle_mode = True if self.DEFAULT_SORT.lower() == "random" else False
         self.original_playlist_order = []
+        self._rng = random.Random()  # Player-owned RNG for shuffles and shuffle-mode picks
+        self._shuffle_deck = []  # Playlist positions still to play in this shuffle cycle
+        self._shuffle_source = None  # Playlist snapshot the deck was dealt from
+        
+        # Load enabled plugins if auto-load is enabled. Plugin imports pull in
+        # heavy dependencies, so they load on a background thread while the
+        # media library is scanned below. Plugins may touch the player as they
+        # load, so the thread only starts once all player state above is set
+        if self.plugin_manager.settings['auto_load_plugins']:
+            self._plugin_loader = threading.Thread(target=self.load_plugins, daemon=True)
+            self._plugin_loader.start()
         
         # Start event loop
         self._start_event_loop()
@@ -164,12 +259,17 @@ class MusicPlayer:
 
         # self.media_handler.add_media_location(self.MUSIC_LIBRARY_PATH)
         self.media_handler.add_media_location(paths)
-        self.media_handler.update_media_index()
+        # Always refresh at startup: this is the only walk of the library, and
+        # the track list below is read straight from the refreshed index
+        self.media_handler.update_media_index(force=True)
         # self.load_media(self.MUSIC_LIBRARY_PATH)
-        for path in paths:
-            self.load_media(path)
-        if self.media:
-            self.user_playlists["Local Media"]["tracks"] = self.media
+        scans = self.media_handler.get_indexed_media(paths, recursive=self.SCAN_SUBDIRECTORIES)
+        for path, entries in zip(paths, scans):
+            self._add_loaded_media(path, self._sort_scanned(entries))
+        
+        # Plugins must be registered before the UI lists their commands
+        if self._plugin_loader:
+            self._plugin_loader.join()
 
         if self.media:
             self.user_playlists["Local Media"] = {
@@ -177,20 +277,50 @@ class MusicPlayer:
                 "file": None  # This is an in-memory playlist
             }
             
-            # Automatically load Local Media as the active playlist
-            self.playlist = self.media.copy()
-            self.current_playlist_name = "Local Media"
-            
-            # Apply sorting if shuffle is enabled
-            if self.shuffle_mode:
-                # Store original playlist order
-                self.original_playlist_order = self.playlist.copy()
-                # Shuffle the playlist
-                random.shuffle(self.playlist)
-            
-            # Notify plugins
-            self.event_bus.publish('on_playlist_loaded', {'playlist': self.playlist})
+            with self._playlist_lock:
+                # Automatically load Local Media as the active playlist
+                self._set_playlist(self.media.copy())
+                self.current_playlist_name = "Local Media"
+                
+                # Apply sorting if shuffle is enabled
+                if self.shuffle_mode:
+                    # Store original playlist order
+                    self.original_playlist_order = self.playlist.copy()
+                    # Shuffle the playlist
+                    self._shuffle_inplace(self.playlist)
+                    self._reindex_playlist()
+                
+                # Notify plugins
+                self._publish_playlist()
+        
+    def _create_media_handler(self):
+        """Create the media handler for the configured AUDIO_BACKEND."""
+        if self.AUDIO_BACKEND == 'miniaudio':
+            try:
+                from modules.miniaudio_handler import MiniaudioHandler
+                return MiniaudioHandler(end_event=self.END_EVENT)
+            except ImportError as e:
+                log.warning("miniaudio backend unavailable (%s); using pygame", e)
+        return MediaHandler()
+
+    def _init_pygame(self):
+        """Initialize the pygame subsystems the media handler needs."""
+        if not self.media_handler.uses_pygame_mixer:
+            # Only the event queue is needed; pygame.init() would also open the
+            # SDL mixer and hold the audio device the backend plays through
+            try:
+                pygame.display.init()
+            except pygame.error as e:
+                log.debug("Could not initialize the pygame event system: %s", e)
+            return
+        
+        pygame.init()  # Only initialize other pygame components
         
+        try:
+            pygame.mixer.music.set_endevent(self.END_EVENT)
+        except pygame.error as e:
+            log.debug("Could not set the mixer end event: %s", e)
+
     def set_player_state(self, state):
         """Update both the enum state and the playback_info state consistently"""
         old_state = self.state
@@ -211,92 +341,66 @@ class MusicPlayer:
 
     def update_playback_info(self, info):
         """Update playback information and publish relevant events"""
-        # Track what fields are changing
-        state_changed = False
-        source_changed = False
-        track_changed = False
-        
-        # Check for specific changes
-        if 'state' in info and info['state'] != self.playback_info['state']:
-            state_changed = True
-            
-            # If state string is changing, update the enum state too
-            state_map = {
-                'PLAYING': PlayerState.PLAYING,
-                'PAUSED': PlayerState.PAUSED,
-                'STOPPED': PlayerState.STOPPED
-            }
-            if info['state'] in state_map and self.state != state_map[info['state']]:
-                self.state = state_map[info['state']]
-        
-        if 'source' in info and info['source'] != self.playback_info['source']:
-            source_changed = True
-                
-        if 'track_name' in info and info['track_name'] != self.playback_info['track_name']:
-            track_changed = True
-        
-        # Update the playback info
-        for key, value in info.items():
-            if key in self.playback_info:
-                self.playback_info[key] = value
+        # Work out once which known fields actually change
+        current = self.playback_info
+        changes = {key: value for key, value in info.items()
+                   if key in current and current[key] != value}
+        if not changes:
+            return
+        
+        # Position ticks change nothing else and have no event; skip the rest
+        if len(changes) == 1 and 'position' in changes:
+            current['position'] = changes['position']
+            return
+        
+        previous_state = current['state']
+        previous_source = current['source']
+        current.update(changes)
         
         # Publish relevant events
-        if state_changed:
+        if 'state' in changes:
+            # If state string is changing, update the enum state too
+            state = self.STATE_MAP.get(changes['state'])
+            if state is not None and self.state != state:
+                self.state = state
             self.event_bus.publish(self.STATE_CHANGED, {
-                'previous_state': self.playback_info['state'],
-                'new_state': info['state'],
-                'source': self.playback_info['source']
+                'previous_state': previous_state,
+                'new_state': changes['state'],
+                'source': current['source']
             })
         
-        if source_changed:
+        if 'source' in changes:
             self.event_bus.publish(self.SOURCE_CHANGED, {
-                'previous_source': self.playback_info['source'],
-                'new_source': info['source']
+                'previous_source': previous_source,
+                'new_source': changes['source']
             })
                 
-        if track_changed:
+        if 'track_name' in changes:
             self.event_bus.publish(self.TRACK_CHANGED, {
-                'track_name': info['track_name'],
-                'artist': self.playback_info.get('artist'),
-                'album': self.playback_info.get('album')
+                'track_name': changes['track_name'],
+                'artist': current.get('artist'),
+                'album': current.get('album')
             })
 
     def _start_event_loop(self):
         """Start the event handling thread"""
         def _event_loop():
             """Background thread for handling events like track ending."""
+            # Bind what the loop uses once instead of looking it up every pass
+            wait = pygame.event.wait
+            end_event = self.END_EVENT
+            on_track_end = self._on_track_end
             while self.running:
-                # Only check pygame status if local playback is active
-                if self.plugin_manager.get_active_plugin() == 'local' and self.state == PlayerState.PLAYING and not pygame.mixer.music.get_busy():
-                    # Track finished playing
-                    old_state = self.state
-                    self.state = PlayerState.STOPPED
-                    
-                    # Publish state change event
-                    self.update_playback_info({'state': 'STOPPED'})
-                    
-                    # Auto-play next track
-                    if self.playlist and len(self.playlist) > 0:
-                        # Move to next track
-                        if self.shuffle_mode:
-                            self.current_index = (random.randint(0, len(self.playlist)) +1) % len(self.playlist)
-                        else:
-                            self.current_index = (self.current_index + 1) % len(self.playlist)
-                        
-                        # Update the current track and publish track change event
-                        old_track = self.current_track
-                        self.current_track = self.playlist[self.current_index]
-                        
-                        # Only publish track change if it's a different track
-                        if old_track != self.current_track:
-                            self.event_bus.publish(self.TRACK_CHANGED, {
-                                'previous_track': old_track,
-                                'new_track': self.current_track
-                            })
-                        
-                        # Play it
-                        self.play()
-                time.sleep(0.1)
+                try:
+                    # Block until pygame posts an event (or the timeout passes)
+                    event = wait(500)
+                except pygame.error:
+                    # No event system (e.g. no video driver): fall back to polling
+                    time.sleep(0.1)
+                    on_track_end()
+                    continue
+                if event.type == end_event:
+                    on_track_end()
         
         # Start the event thread
         self.event_thread = threading.Thread(target=_event_loop)
@@ -304,6 +408,257 @@ class MusicPlayer:
         self.event_thread.start()
 
 
+    def _set_playlist(self, tracks):
+        """Replace the active playlist and invalidate its position index."""
+        self.playlist = tracks
+        self._reindex_playlist()
+
+    def _reindex_playlist(self):
+        """Mark the track -> position index stale after the playlist is reordered.
+        
+        The index is rebuilt by _positions on the next lookup, so a run of
+        removals or reorders pays for one rebuild instead of one each.
+        """
+        self._playlist_index = None
+        self._playlist_tuple = None
+
+    def _positions(self):
+        """Return the track -> first position index, rebuilding it if stale."""
+        index = self._playlist_index
+        if index is None:
+            index = {}
+            for i, track in enumerate(self.playlist):
+                index.setdefault(track, i)
+            self._playlist_index = index
+        return index
+
+    def _append_playlist(self, track):
+        """Append a track to the active playlist."""
+        self._positions().setdefault(track, len(self.playlist))
+        self.playlist.append(track)
+        self._playlist_tuple = None
+
+    def _merge_playlist(self, tracks):
+        """Append the tracks not already in the active playlist, keeping their order.
+        
+        Membership is checked against the position index, so the merge is
+        O(n + m) rather than scanning the playlist for every track.
+        
+        Args:
+            tracks (iterable): Track paths to merge; consumed once, so an iterator works
+        
+        Returns:
+            list: The tracks that were added
+        """
+        index = self._positions()
+        added = []
+        for track in tracks:
+            if track not in index:
+                index[track] = len(self.playlist) + len(added)
+                added.append(track)
+        self.playlist.extend(added)
+        if added:
+            self._playlist_tuple = None
+        return added
+
+    def _remove_playlist_at(self, i):
+        """Remove and return the track at a position in the active playlist.
+        
+        Popping the tail leaves every other position unchanged, so the index
+        is patched in place; any other removal marks it stale instead of
+        rebuilding it on every call.
+        """
+        track = self.playlist.pop(i)
+        index = self._playlist_index
+        if index is not None and i == len(self.playlist) and index.get(track) == i:
+            del index[track]
+            self._playlist_tuple = None
+        else:
+            self._reindex_playlist()
+        return track
+
+    def _playlist_view(self):
+        """Return the active playlist as a tuple, built once per change.
+        
+        Plugins get this shared snapshot instead of the live list, so
+        publishing does not copy the playlist and handlers cannot mutate it.
+        A new snapshot is only built after a change, so _playlist_version
+        is bumped here and identifies the snapshot's contents.
+        """
+        if self._playlist_tuple is None:
+            self._playlist_tuple = tuple(self.playlist)
+            self._playlist_version += 1
+        return self._playlist_tuple
+
+    def _publish_playlist(self, added=None, removed=None):
+        """Notify plugins that the active playlist was loaded or changed.
+        
+        Incremental changes are coalesced: changes within NOTIFY_DELAY
+        seconds, or inside a batch_updates() block, are merged into one net
+        delta and published once by _flush_notify. A wholesale reload is
+        published right away (or when the enclosing batch ends), together
+        with anything still pending.
+        
+        Args:
+            added (sequence, optional): Tracks added to the playlist
+            removed (sequence, optional): Tracks removed from the playlist.
+                Leave both as None when the playlist was replaced wholesale
+        """
+        with self._notify_lock:
+            pending = self._notify_pending
+            if pending is None:
+                # Dicts keep insertion order, so they serve as ordered sets
+                pending = self._notify_pending = {'added': {}, 'removed': {}, 'reloaded': False}
+            if added is None and removed is None:
+                pending['reloaded'] = True
+            # A track added and then removed (or the reverse) cancels out
+            for track in added or ():
+                if pending['removed'].pop(track, False) is False:
+                    pending['added'][track] = None
+            for track in removed or ():
+                if pending['added'].pop(track, False) is False:
+                    pending['removed'][track] = None
+            
+            if self._batch_depth:
+                return
+            flush_now = pending['reloaded']
+            if flush_now:
+                if self._notify_timer is not None:
+                    self._notify_timer.cancel()
+                    self._notify_timer = None
+            elif self._notify_timer is None:
+                self._notify_timer = threading.Timer(self.NOTIFY_DELAY, self._flush_notify)
+                self._notify_timer.daemon = True
+                self._notify_timer.start()
+        if flush_now:
+            self._flush_notify()
+
+    def _flush_notify(self):
+        """Publish the coalesced playlist notification, if any.
+        
+        on_playlist_loaded always carries the full snapshot, with a
+        playlist_version that plugins can compare against the last one they
+        handled to skip unchanged playlists. If the playlist was only changed
+        incrementally, on_playlist_changed is also published with just the net
+        added and removed tracks, so plugins can skip a rescan.
+        
+        May run on the timer thread, so the pending delta and the snapshot
+        are taken together under the playlist lock; a mutation can't land
+        between them or tear the snapshot.
+        """
+        with self._playlist_lock:
+            with self._notify_lock:
+                self._notify_timer = None
+                if self._batch_depth:
+                    return  # The enclosing batch flushes on exit
+                pending, self._notify_pending = self._notify_pending, None
+            if pending is None:
+                return
+            view = self._playlist_view()
+            version = self._playlist_version
+        
+        added = tuple(pending['added'])
+        removed = tuple(pending['removed'])
+        self.event_bus.publish('on_playlist_loaded', {
+            'playlist': view,
+            'playlist_view': view,
+            'playlist_version': version,
+            'length': len(view),
+            'added': added,
+            'removed': removed
+        })
+        if (added or removed) and not pending['reloaded']:
+            self.event_bus.publish('on_playlist_changed', {
+                'playlist_version': version,
+                'added': added,
+                'removed': removed
+            })
+
+    @contextmanager
+    def batch_updates(self):
+        """Hold playlist notifications until the block exits, then publish one.
+        
+        Example:
+            with player.batch_updates():
+                for directory in old_locations:
+                    player.remove_library_location(directory)
+        """
+        with self._notify_lock:
+            self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self._notify_lock:
+                self._batch_depth -= 1
+                outermost = self._batch_depth == 0
+                if outermost and self._notify_timer is not None:
+                    self._notify_timer.cancel()
+                    self._notify_timer = None
+            if outermost:
+                self._flush_notify()
+
+    def _shuffle_inplace(self, tracks):
+        """Shuffle a list of tracks in place with the player's RNG."""
+        self._rng.shuffle(tracks)
+
+    def _next_shuffle_index(self):
+        """Pick the next playlist position in shuffle mode.
+        
+        Positions are dealt from a deck shuffled once per cycle, so every
+        track plays once before any repeats. The deck is re-dealt when it
+        runs out or the playlist changes, and a new deck never starts with
+        the track that just played.
+        
+        Returns:
+            int: Playlist position to play next
+        """
+        view = self._playlist_view()
+        if self._shuffle_source is not view or not self._shuffle_deck:
+            deck = list(range(len(view)))
+            self._rng.shuffle(deck)
+            # Tracks are popped from the end
+            if len(deck) > 1 and deck[-1] == self.current_index:
+                deck[0], deck[-1] = deck[-1], deck[0]
+            self._shuffle_deck = deck
+            self._shuffle_source = view
+        return self._shuffle_deck.pop()
+
+    def _on_track_end(self):
+        """Advance to the next track when local playback has finished."""
+        # The end event is also posted when playback is stopped or replaced, so
+        # only advance if local playback is active and the mixer is really idle
+        # The state check is cheapest, so it runs first and short-circuits the rest
+        if self.state is PlayerState.PLAYING and self.plugin_manager.get_active_plugin() == 'local' and not self.media_handler.is_audio_playing():
+            # Track finished playing
+            self.state = PlayerState.STOPPED
+            
+            # Publish state change event
+            self.update_playback_info({'state': 'STOPPED'})
+            
+            # Auto-play next track
+            with self._playlist_lock:
+                if not self.playlist:
+                    return
+                # Move to next track
+                if self.shuffle_mode:
+                    self.current_index = self._next_shuffle_index()
+                else:
+                    self.current_index = (self.current_index + 1) % len(self.playlist)
+                
+                # Update the current track and publish track change event
+                old_track = self.current_track
+                self.current_track = self.playlist[self.current_index]
+            
+            # Only publish track change if it's a different track
+            if old_track != self.current_track:
+                self.event_bus.publish(self.TRACK_CHANGED, {
+                    'previous_track': old_track,
+                    'new_track': self.current_track
+                })
+            
+            # Play it
+            self.play()
+
     @log_function_call
     def prepare_plugin_playback(self, plugin_name):
         """
@@ -325,9 +680,32 @@ class MusicPlayer:
     def load_plugins(self):
         """Load enabled plugins from the plugins directory."""
         loaded_count = self.plugin_manager.load_enabled_plugins(self.plugins_dir, self)
-        self.plugins = self.plugin_manager.get_all_plugins()
+        self._refresh_plugins()
         return loaded_count
     
+    def _refresh_plugins(self):
+        """Re-read the registered plugins and rebuild their action table.
+        
+        Each plugin's pause/stop/next/prev methods are looked up once here,
+        so playback controls dispatch with a dict lookup.
+        """
+        self.plugins = self.plugin_manager.get_all_plugins()
+        methods = {}
+        for name, info in self.plugins.items():
+            instance = info.get('instance') if isinstance(info, dict) else info
+            methods[name] = {action: getattr(instance, action, None)
+                             for action in self.PLUGIN_ACTIONS}
+        self._plugin_methods = methods
+    
+    def _plugin_method(self, plugin_name, action):
+        """Return a plugin's bound method for a playback action, or None."""
+        methods = self._plugin_methods.get(plugin_name)
+        if methods is None:
+            # Registered outside load/enable (or not yet seen); rebuild once
+            self._refresh_plugins()
+            methods = self._plugin_methods.get(plugin_name, {})
+        return methods.get(action)
+    
     def enable_plugin(self, plugin_name):
         """Enable a specific plugin."""
         if self.plugin_manager.enable_plugin(plugin_name):
@@ -336,7 +714,7 @@ class MusicPlayer:
             if plugin_info and not plugin_info['loaded']:
                 self.plugin_manager.load_plugin(plugin_name, plugin_info['path'], self)
                 # Update local plugins dictionary
-                self.plugins = self.plugin_manager.get_all_plugins()
+                self._refresh_plugins()
             return True
         return False
     
@@ -344,7 +722,7 @@ class MusicPlayer:
         """Disable a specific plugin."""
         if self.plugin_manager.disable_plugin(plugin_name):
             # Update local plugins dictionary
-            self.plugins = self.plugin_manager.get_all_plugins()
+            self._refresh_plugins()
             return True
         return False
     
@@ -363,17 +741,37 @@ class MusicPlayer:
     
     def load_media(self, directory):
         """Load all music files from a directory."""
-        media = []
         # Add the directory to our index if it's not already there
-        if self.media_handler.add_media_location(directory):
-            # Update the index to scan the new location
-            self.media_handler.update_media_index(force=True)
+        self.media_handler.add_media_location(directory)
+        
+        # One walk both indexes the directory and lists its tracks
+        tracks, mtimes = self.media_handler.scan_and_index(directory, recursive=self.SCAN_SUBDIRECTORIES)
+        self._mtime.update(mtimes)
+        sort_method = self.DEFAULT_SORT.lower()
+        if sort_method == 'name':
+            tracks.sort(key=lambda path: os.path.basename(path).lower())
+        elif sort_method == 'date':
+            tracks.sort(key=mtimes.__getitem__)
+        
+        self._add_loaded_media(directory, tracks)
+    
+    def _sort_scanned(self, entries):
+        """Order one directory's scan results by DEFAULT_SORT.
+        
+        Args:
+            entries (list): (path, mtime, name_lower) tuples from the media handler
         
-        # For backward compatibility, also use the direct load method
-        direct_files = self.media_handler.load_media_from_directory(
-            directory, 
-            recursive=self.SCAN_SUBDIRECTORIES
-        )
+        Returns:
+            list: Paths of the music files found
+        """
+        # Each entry carries its mtime and lowercased name, so sorting
+        # never has to re-stat or re-basename a path
+        self._mtime.update((path, mtime) for path, mtime, _ in entries)
+        sort_method = self.DEFAULT_SORT.lower()
+        if sort_method == 'name':
+            entries.sort(key=itemgetter(2))
+        elif sort_method == 'date':
+            entries.sort(key=itemgetter(1))
         
         # # Get all tracks from the media handler index
         # indexed_files = self.media_handler.get_all_indexed_tracks(
@@ -383,11 +781,19 @@ class MusicPlayer:
         
         # Merge both sets of files (indexed and direct)
         # media = list(set(direct_files + indexed_files))
-        media = list(direct_files)
-                
+        return [path for path, _, _ in entries]
+    
+    def _add_loaded_media(self, directory, media):
+        """Merge the tracks scanned from a directory into the media library."""
         # Print loading summary
         print(f"Loaded {len(media)} tracks from {directory}")
-        self.media.extend(media)
+        # Overlapping library paths would list the same file twice; dedupe
+        # against the library's path set and append only the new tracks
+        seen = self._media_set
+        for path in media:
+            if path not in seen:
+                seen[path] = None
+                self.media.append(path)
         
     def play(self):
         """Start or resume playback."""
@@ -396,37 +802,11 @@ class MusicPlayer:
         
         # Now proceed with normal play logic based on current state
         if self.state == PlayerState.STOPPED:
-            if self.playlist and self.current_index < len(self.playlist):
-                self.current_track = self.playlist[self.current_index]
-                # print(f"Playing track: {os.path.basename(self.current_track)}")
-                
-                # Get track duration before playing
-                self.current_track_length = self.media_handler.get_track_duration(self.current_track)
-                
-                # Use MediaHandler method to play
-                success, temp_file = self.media_handler.play_audio(self.current_track)
-                if not success:
-                    print(f"Cannot play {os.path.basename(self.current_track)}: format not supported")
-                    return
-                
-                self.track_start_time = time.time()
-                self.state = PlayerState.PLAYING
-                
-                # Update playback info and publish state events
-                self.update_playback_info({
-                    'state': 'PLAYING',
-                    'track_name': os.path.basename(self.current_track),
-                    'source': 'local'
-                })
-                
-                # Make sure plugin manager knows local is the active source
-                self.plugin_manager.set_active_plugin('local')
-                
-                # Update play stats
-                self.media_handler.update_play_stats(self.current_track)
-                
-                # For backward compatibility, still publish the on_play event
-                self.event_bus.publish('on_play', {'track': self.current_track})
+            with self._playlist_lock:
+                track = (self.playlist[self.current_index]
+                         if 0 <= self.current_index < len(self.playlist) else None)
+            if track is not None:
+                self._start_track(track)
             else:
                 print("No tracks in playlist")
         elif self.state == PlayerState.PAUSED:
@@ -436,6 +816,45 @@ class MusicPlayer:
             # Update playback state and publish state event
             self.update_playback_info({'state': 'PLAYING'})
                 
+    def _start_track(self, track):
+        """Start local playback of a track from the beginning."""
+        self.current_track = track
+        self._track_meta_loaded = None  # get_current_playback refills the tags on its next poll
+        # print(f"Playing track: {os.path.basename(self.current_track)}")
+        
+        # Get track duration before playing; metadata already read for this
+        # track has it, otherwise the index does, so the file isn't re-probed
+        self.current_track_length = (self._meta_cache.get(track, {}).get('duration')
+                                     or self.media_handler.get_duration_from_index(track)
+                                     or self.media_handler.get_track_duration(track, use_index=False))
+        
+        # Use MediaHandler method to play
+        success, temp_file = self.media_handler.play_audio(track)
+        if not success:
+            print(f"Cannot play {os.path.basename(track)}: format not supported")
+            return False
+        
+        self.track_start_time = time.monotonic_ns()
+        self._last_position_query = 0  # Re-read the mixer position for the new track
+        self.state = PlayerState.PLAYING
+        
+        # Update playback info and publish state events
+        self.update_playback_info({
+            'state': 'PLAYING',
+            'track_name': os.path.basename(track),
+            'source': 'local'
+        })
+        
+        # Make sure plugin manager knows local is the active source
+        self.plugin_manager.set_active_plugin('local')
+        
+        # Update play stats
+        self.media_handler.update_play_stats(track)
+        
+        # For backward compatibility, still publish the on_play event
+        self.event_bus.publish('on_play', {'track': track})
+        return True
+
     def get_current_playback(self):
         """
         Get information about what's currently playing, regardless of source.
@@ -444,42 +863,68 @@ class MusicPlayer:
             dict: A dictionary with current playback information
         """
         # If it's local playback and we're playing, update the position
-        current_playback = self.playback_info.copy()
         if self.state == PlayerState.PLAYING:
-            if current_playback['source'] == 'local':
-                #! Prioritizing meta tags, else getting from media handler (index then direct check)
-                metadata = self.media_handler.get_metadata_from_tags(self.current_track) 
-                data = self.media_handler.get_metadata_from_file(self.current_track)
-                elapsed = time.time() - self.track_start_time   
-                #! Get metadata if exists, otherwise use local data
-                track_name = (metadata and metadata.get('title')) or (data and data.get('track_name')) or None
-                duration = (metadata and metadata.get('duration')) or (data and data.get('duration')) or None
-                # Get metadata if exists, local data on this does not exist
-                artist = metadata['artist'] if metadata and 'artist' in metadata else None
-                album = metadata['album'] if metadata and 'album' in metadata else None
-                genre = metadata['genre'] if metadata and 'genre' in metadata else None
-                bitrate = metadata['bitrate'] if metadata and 'bitrate' in metadata else None
-                year = metadata['year'] if metadata and 'year' in metadata else None
-
-                self.update_playback_info({
-                                'track_name': track_name,
-                                'position': min(elapsed, duration),
-                                'duration': duration,
-                                'artist': artist,
-                                'album': album,
-                                'genre': genre,
-                                'bitrate': bitrate,
-                                'year': year,
-                                'source': 'local',
-                                'state': 'PLAYING' 
-                            })
-            else:
-                # Use the plugin manager to get current playback info
-                current_playback = self.plugin_manager.get_playback_info()
-        
-            return current_playback
+            if self.playback_info['source'] == 'local':
+                elapsed = (time.monotonic_ns() - self.track_start_time) / 1e9
+                if self._track_meta_loaded != self.current_track:
+                    # First poll for this track: fill in its tags (read once
+                    # per track and cached) and publish any changes
+                    track_info = self._cached_track_info(self.current_track)
+                    # Fall back to the length found when the track started
+                    duration = track_info['duration'] or self.current_track_length
+                    track_info = {**track_info, 'duration': duration}
+                    self.update_playback_info({
+                                    **track_info,
+                                    'position': min(elapsed, duration) if duration else elapsed,
+                                    'source': 'local',
+                                    'state': 'PLAYING' 
+                                })
+                    self._track_meta_loaded = self.current_track
+                else:
+                    # Later polls only move the position, which has no event
+                    duration = self.playback_info['duration']
+                    self.playback_info['position'] = min(elapsed, duration) if duration else elapsed
+                return self.playback_info.copy()
+            
+            # Use the plugin manager to get current playback info
+            return self.plugin_manager.get_playback_info()
         return self.playback_info
 
+    def _cached_track_info(self, track):
+        """Return a track's playback_info fields, reading its tags only on a cache miss.
+        
+        The cache keeps the META_CACHE_SIZE most recently used tracks, so
+        going back to a recent track doesn't re-read its tags either.
+        """
+        cache = self._meta_cache
+        track_info = cache.get(track)
+        if track_info is None:
+            track_info = cache[track] = self._read_track_info(track)
+            if len(cache) > self.META_CACHE_SIZE:
+                cache.popitem(last=False)
+        else:
+            cache.move_to_end(track)
+        return track_info
+
+    def _read_track_info(self, track):
+        """Read the playback_info fields for a local track from its tags and the index."""
+        #! Prioritizing meta tags, else getting from media handler (index then direct check)
+        metadata = self.media_handler.get_metadata_from_tags(track) 
+        data = self.media_handler.get_metadata_from_file(track)
+        #! Get metadata if exists, otherwise use local data
+        track_name = (metadata and metadata.get('title')) or (data and data.get('track_name')) or None
+        duration = (metadata and metadata.get('duration')) or (data and data.get('duration')) or None
+        # Get metadata if exists, local data on this does not exist
+        return {
+            'track_name': track_name,
+            'duration': duration,
+            'artist': metadata['artist'] if metadata and 'artist' in metadata else None,
+            'album': metadata['album'] if metadata and 'album' in metadata else None,
+            'genre': metadata['genre'] if metadata and 'genre' in metadata else None,
+            'bitrate': metadata['bitrate'] if metadata and 'bitrate' in metadata else None,
+            'year': metadata['year'] if metadata and 'year' in metadata else None,
+        }
+
     def pause(self):
         """Pause playback."""
         # Check if we're controlling local playback or a plugin
@@ -497,9 +942,9 @@ class MusicPlayer:
             
         elif active_plugin != 'local':
             # Let the plugin handle it
-            plugin = self.plugins.get(active_plugin)
-            if plugin and hasattr(plugin, 'pause'):
-                plugin.pause([])
+            pause = self._plugin_method(active_plugin, 'pause')
+            if pause:
+                pause([])
     
     def stop(self):
         """Stop playback."""
@@ -518,12 +963,10 @@ class MusicPlayer:
             
         elif active_plugin != 'local':
             # Let the plugin handle it
-            plugin = self.plugins.get(active_plugin)
-            if plugin and hasattr(plugin, 'stop'):
-                plugin.stop([])
-            elif plugin and hasattr(plugin, 'pause'):
-                # If no stop method, try pause as fallback
-                plugin.pause([])
+            # If no stop method, try pause as fallback
+            stop = self._plugin_method(active_plugin, 'stop') or self._plugin_method(active_plugin, 'pause')
+            if stop:
+                stop([])
     
     def next_track(self):
         """Play the next track in the playlist."""
@@ -532,18 +975,21 @@ class MusicPlayer:
         
         if active_plugin != 'local':
             # Let the active plugin handle next track
-            plugin = self.plugins.get(active_plugin)
-            if plugin and hasattr(plugin, 'next'):
-                plugin.next([])
+            next_method = self._plugin_method(active_plugin, 'next')
+            if next_method:
+                next_method([])
                 return
         
         # Local playback handling
         if self.playlist:
             self.stop()
-            if self.shuffle_mode:
-                self.current_index = (random.randint(0, len(self.playlist)) +1) % len(self.playlist)
-            else:
-                self.current_index = (self.current_index + 1) % len(self.playlist)
+            with self._playlist_lock:
+                if not self.playlist:
+                    return
+                if self.shuffle_mode:
+                    self.current_index = self._next_shuffle_index()
+                else:
+                    self.current_index = (self.current_index + 1) % len(self.playlist)
             self.play()
 
     def previous_track(self):
@@ -553,15 +999,18 @@ class MusicPlayer:
         
         if active_plugin != 'local':
             # Let the active plugin handle previous track
-            plugin = self.plugins.get(active_plugin)
-            if plugin and hasattr(plugin, 'prev'):
-                plugin.prev([])
+            prev_method = self._plugin_method(active_plugin, 'prev')
+            if prev_method:
+                prev_method([])
                 return
         
         # Local playback handling
         if self.playlist:
             self.stop()
-            self.current_index = (self.current_index - 1) % len(self.playlist)
+            with self._playlist_lock:
+                if not self.playlist:
+                    return
+                self.current_index = (self.current_index - 1) % len(self.playlist)
             self.play()
     
     def get_playback_position(self):
@@ -576,13 +1025,19 @@ class MusicPlayer:
         if self.state == PlayerState.STOPPED:
             return 0
         
-        # Get position from MediaHandler
-        pos = self.media_handler.get_audio_position()  # Use new method
-        if pos > 0:  # If valid position
-            return pos / 1000.0  # Convert from ms to seconds
+        # Ask the mixer at most once a second and re-anchor the clock to it;
+        # in between, derive the position from the monotonic clock. Times are
+        # integer nanoseconds and only become float seconds on return
+        now = time.monotonic_ns()
+        if now - self._last_position_query >= 1_000_000_000:
+            self._last_position_query = now
+            pos = self.media_handler.get_audio_position()  # Use new method
+            if pos > 0:  # If valid position
+                self.track_start_time = now - pos * 1_000_000  # Convert from ms to ns
+                return pos / 1000.0
             
         # Fallback to time-based tracking
-        elapsed = time.time() - self.track_start_time
+        elapsed = (now - self.track_start_time) / 1e9
         return elapsed
     
     def get_status(self):
@@ -623,14 +1078,27 @@ class MusicPlayer:
         """Clean shutdown of the player."""
         self.running = False
         
+        # Wake the event thread so it sees running is False straight away,
+        # and let it exit before pygame is torn down
+        try:
+            pygame.event.post(pygame.event.Event(pygame.QUIT))
+        except pygame.error:
+            pass
+        if self.event_thread is not threading.current_thread():
+            self.event_thread.join(timeout=1.0)
+        
+        # From here on events are delivered synchronously, so the stop and
+        # shutdown handlers have all run by the time pygame.quit() is called
+        self.event_bus.shutdown()
+        
         # Get the current active plugin before stopping
         active_plugin = self.plugin_manager.get_active_plugin()
         
         # Stop all playback
         try:
             self.stop()
-        except Exception as e:
-            print(f"Warning when stopping playback: {e}")
+        except Exception:
+            log.exception("Error stopping playback during shutdown")
         
         # Set local as active to prevent plugin conflicts during shutdown
         self.plugin_manager.set_active_plugin('local')
@@ -638,16 +1106,26 @@ class MusicPlayer:
         # Notify all plugins about shutdown using event bus
         self.event_bus.publish('on_shutdown', {})
         
+        # Drop any playlist notification still waiting to be sent
+        with self._notify_lock:
+            if self._notify_timer is not None:
+                self._notify_timer.cancel()
+                self._notify_timer = None
+        
+        # Abandon any queued background refresh
+        if self._library_executor is not None:
+            self._library_executor.shutdown(wait=False, cancel_futures=True)
+        
         # Clean up media handler
         try:
             self.media_handler.cleanup()
-        except Exception as e:
-            print(f"Warning cleaning up media handler: {e}")
+        except Exception:
+            log.exception("Error cleaning up media handler")
         
         try:
             pygame.quit()
-        except Exception as e:
-            print(f"Warning quitting pygame: {e}")
+        except Exception:
+            log.exception("Error quitting pygame")
 
     def set_volume(self, volume):
         """Set the volume level (0.0 to 1.0)."""
@@ -686,9 +1164,10 @@ class MusicPlayer:
             return False
         
         # Set the tracks from the playlist
-        self.playlist = tracks.copy()
-        self.current_index = 0
-        self.current_playlist_name = playlist_name
+        with self._playlist_lock:
+            self._set_playlist(tracks.copy())
+            self.current_index = 0
+            self.current_playlist_name = playlist_name
         
         # Apply sorting if shuffle is enabled
         # if self.shuffle_mode:
@@ -698,7 +1177,7 @@ class MusicPlayer:
         #     random.shuffle(self.playlist)
         
         # Notify plugins
-        self.event_bus.publish('on_playlist_loaded', {'playlist': self.playlist})
+        self._publish_playlist()
         
         print(f"\nLoaded playlist: {playlist_name} ({len(self.playlist)} tracks)")
         return True
@@ -728,10 +1207,23 @@ class MusicPlayer:
             #     insert_idx = random.randint(0, len(self.playlist))
             #     self.playlist.insert(insert_idx, track_path)
             # else:
-            self.playlist.append(track_path)
+            with self._playlist_lock:
+                self._append_playlist(sys.intern(track_path))
         
         return result
 
+    def track_position(self, track):
+        """Find where a track sits in the active playlist.
+        
+        Args:
+            track (str): Path of the track
+            
+        Returns:
+            int or None: Position of the track's first occurrence, or None if absent
+        """
+        with self._playlist_lock:
+            return self._positions().get(track)
+
     def remove_from_playlist(self, playlist_name, track_index):
         """Remove a track from a playlist by index."""
         # Get the track before removal (for updating current playlist)
@@ -758,12 +1250,13 @@ class MusicPlayer:
             #     except ValueError:
             #         pass
             # else:
-            if track_index < self.current_index:
-                self.current_index -= 1
-            elif track_index == self.current_index:
-                # If removing current track, stop playback
-                self.stop()
-            self.playlist.pop(track_index)
+            with self._playlist_lock:
+                if track_index < self.current_index:
+                    self.current_index -= 1
+                elif track_index == self.current_index:
+                    # If removing current track, stop playback
+                    self.stop()
+                self._remove_playlist_at(track_index)
         
         return result
 
@@ -779,7 +1272,9 @@ class MusicPlayer:
     
     def toggle_shuffle(self):
         """Toggle shuffle mode on/off."""
-        self.shuffle_mode = not self.shuffle_mode
+        with self._playlist_lock:
+            self.shuffle_mode = not self.shuffle_mode
+            self._shuffle_deck = []  # Start a fresh cycle next time shuffle picks a track
         
         # # Only affects local playback
         # if self.playlist:
@@ -826,31 +1321,45 @@ class MusicPlayer:
         status = "enabled" if self.shuffle_mode else "disabled"
         return status
 
-    def add_library_location(self, directory):
+    def _submit_library_task(self, fn, *args, **kwargs):
+        """Run a library operation on the background library thread.
+        
+        Returns:
+            Future: Resolves to the operation's return value
+        """
+        if self._library_executor is None:
+            # One worker so background library operations run one at a time
+            self._library_executor = ThreadPoolExecutor(max_workers=1)
+        return self._library_executor.submit(fn, *args, **kwargs)
+
+    def add_library_location(self, directory, wait=True):
         """Add a new location to the media library.
         
         Args:
             directory (str): Path to the directory to add
+            wait (bool): Block until the location is scanned. If False, the scan
+                runs on a background thread and a Future is returned instead;
+                plugins get on_playlist_loaded when it finishes
             
         Returns:
-            bool: True if successful, False if already indexed or not found
+            bool or Future: True if successful, False if already indexed or not
+                found, or a Future resolving to True once the scan is done
         """
         # Add to media handler
         if self.media_handler.add_media_location(directory):
+            print(f"Added library location: {directory}")
+            if not wait:
+                return self._submit_library_task(self._index_added_location)
+            return self._index_added_location()
+        else:
+            print(f"Location already indexed: {directory}")
+            return False
+    
+    def _index_added_location(self):
+        """Scan a newly added location and merge its tracks into the playlist."""
+        with self._library_lock:
             # Update the index
             self.media_handler.update_media_index(force=True)
-            print(f"Added library location: {directory}")
-            
-            # # Refresh the playlist
-            all_tracks = self.media_handler.get_all_indexed_tracks(
-                sort_method=self.DEFAULT_SORT.lower(),
-                # shuffle=self.shuffle_mode
-            )
-            
-            # Update playlist with new tracks
-            for track in all_tracks:
-                if track not in self.playlist:
-                    self.playlist.append(track)
             
             # # Apply sorting if needed
             # if self.DEFAULT_SORT.lower() == 'name':
@@ -860,13 +1369,30 @@ class MusicPlayer:
             # elif self.shuffle_mode:
             #     random.shuffle(self.playlist)
             
-            # Notify plugins
-            self.event_bus.publish('on_playlist_loaded', {'playlist': self.playlist})
+            # Update playlist with new tracks
+            self._merge_tracks_into_playlist()
+        
+        return True
+    
+    def _merge_tracks_into_playlist(self):
+        """Add newly indexed tracks to the playlist and notify plugins.
+        
+        Shared by every library operation that can add tracks, so they
+        all merge in the same order and publish the same change event.
+        
+        Returns:
+            int: Number of tracks added
+        """
+        all_tracks = self.media_handler.iter_all_indexed_tracks(self.DEFAULT_SORT.lower())
+        # Runs on the library worker when wait=False, so it must hold the same
+        # lock as the UI and event threads while it extends the playlist
+        with self._playlist_lock:
+            added = self._merge_playlist(all_tracks)
             
-            return True
-        else:
-            print(f"Location already indexed: {directory}")
-            return False
+            # Notify plugins, unless the playlist didn't change
+            if added:
+                self._publish_playlist(added=tuple(added))
+        return len(added)
     
     def remove_library_location(self, directory):
         """Remove a location from the media library.
@@ -877,31 +1403,48 @@ class MusicPlayer:
         Returns:
             bool: True if successful, False if not found
         """
-        # Remove from media handler
-        if self.media_handler.remove_media_location(directory):
-            # Update the index
-            self.media_handler.update_media_index(force=True)
+        # Remove from media handler; it drops the location's index entries and
+        # reports which paths went, so the rest of the library isn't rescanned.
+        # Held under the library lock so a background scan can't merge in between
+        with self._library_lock:
+            return self._remove_location_tracks(directory)
+    
+    def _remove_location_tracks(self, directory):
+        """Drop a location from the index and its tracks from the playlist."""
+        removed_paths = self.media_handler.remove_media_location(directory)
+        if removed_paths is not None:
             print(f"Removed library location: {directory}")
             
-            # Get current tracks after removal
-            current_tracks = self.media_handler.get_all_indexed_tracks()
-            
-            # Filter playlist to remove tracks that are no longer available
-            # Keep track of whether current track is removed
-            current_track_removed = False
-            if self.current_track and self.current_track not in current_tracks:
-                current_track_removed = True
-            
-            # Update playlist
-            self.playlist = [track for track in self.playlist if track in current_tracks]
-            
-            # Stop playback if current track was removed
-            if current_track_removed and self.state != PlayerState.STOPPED:
-                self.stop()
-                self.current_index = 0
-            
-            # Notify plugins
-            self.event_bus.publish('on_playlist_loaded', {'playlist': self.playlist})
+            with self._playlist_lock:
+                # Nothing to filter or announce if none of the removed files are queued.
+                # The keys view checks whichever side is smaller against the other
+                if self._positions().keys().isdisjoint(removed_paths):
+                    return True
+                
+                # Keep track of whether current track is removed
+                current_track_removed = self.current_track in removed_paths
+                
+                # Update playlist, keeping the dropped tracks for the change notification.
+                # The cursor moves back by the number of tracks dropped before it, so
+                # it stays on the current track, or on the next survivor if that went
+                kept, removed = [], []
+                new_index = self.current_index
+                for i, track in enumerate(self.playlist):
+                    if track in removed_paths:
+                        removed.append(track)
+                        if i < self.current_index:
+                            new_index -= 1
+                    else:
+                        kept.append(track)
+                self._set_playlist(kept)
+                self.current_index = max(0, min(new_index, len(kept) - 1))
+                
+                # Stop playback if current track was removed
+                if current_track_removed and self.state != PlayerState.STOPPED:
+                    self.stop()
+                
+                # Notify plugins
+                self._publish_playlist(removed=tuple(removed))
             
             return True
         else:
@@ -912,37 +1455,46 @@ class MusicPlayer:
         """Get all locations in the media library.
         
         Returns:
-            list: List of indexed directory paths
+            tuple: Indexed directory paths (shared and read-only; copy to modify)
         """
         return self.media_handler.get_media_locations()
     
-    def search_library(self, query, limit=20):
+    def search_library(self, query, limit=20, *, locations=None, media_types=None):
         """Search for tracks across all indexed locations.
         
         Args:
             query (str): Search query
             limit (int): Maximum number of results
+            locations (list, optional): Only return tracks under these directories
+            media_types (list, optional): Only return tracks with these extensions
             
         Returns:
             list: Media files matching the query
         """
-        return self.media_handler.search_tracks(query, limit=limit)
+        return self.media_handler.search_tracks(query, limit=limit,
+                                                locations=locations, media_types=media_types)
     
-    def refresh_library(self):
-        """Force a refresh of the media library index.
+    def refresh_library(self, wait=True, rebuild=False):
+        """Refresh the media library index.
+        
+        Every location is rescanned, but only new or changed files are
+        re-read unless a full rebuild is requested.
+        
+        Args:
+            wait (bool): Block until the refresh finishes. If False, the refresh
+                runs on a background thread and a Future is returned instead
+            rebuild (bool): Re-read metadata for every file, not just changed ones
         
         Returns:
-            int: Number of tracks indexed
+            int or Future: Number of tracks indexed, or a Future resolving to it
         """
-        count = self.media_handler.update_media_index(force=True)
-        
-        # Refresh the playlist with any new tracks
-        all_tracks = self.media_handler.get_all_indexed_tracks()
-        for track in all_tracks:
-            if track not in self.playlist:
-                self.playlist.append(track)
+        if not wait:
+            return self._submit_library_task(self.refresh_library, rebuild=rebuild)
         
-        # Notify plugins
-        self.event_bus.publish('on_playlist_loaded', {'playlist': self.playlist})
+        with self._library_lock:
+            count = self.media_handler.update_media_index(force=True, rebuild=rebuild)
+            
+            # Refresh the playlist with any new tracks
+            self._merge_tracks_into_playlist()
         
         return count
\ No newline at end of file
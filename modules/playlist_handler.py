@@ -1,7 +1,9 @@
 # modules/playlist_handler.py
 import os
+import sys
 import time
 import random
+from modules.logging_utils import app_logger as log
 
 class PlaylistHandler:
     """Handles playlist operations like loading, saving, and managing playlists."""
@@ -54,6 +56,7 @@ class PlaylistHandler:
                 with open(playlist_path, 'r', encoding='utf-8') as f:
                     # Read and process lines
                     tracks = []
+                    missing = []
                     playlist_name = default_name  # Default to filename
                     
                     for line in f:
@@ -68,9 +71,15 @@ class PlaylistHandler:
                         elif line:  # Non-empty lines are track paths
                             # Check if the track exists
                             if os.path.exists(line):
-                                tracks.append(line)
+                                # Interned so it shares storage with the library's copy
+                                tracks.append(sys.intern(line))
                             else:
-                                print(f"Warning: Track not found: {line}")
+                                missing.append(line)
+                    
+                    # One line per playlist rather than one per missing track
+                    if missing:
+                        print(f"Warning: {len(missing)} tracks not found in playlist: {playlist_name}")
+                        log.debug("Missing tracks in %s: %s", playlist_name, missing)
                     
                     # Store the playlist if it has tracks
                     if tracks:
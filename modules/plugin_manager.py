@@ -94,23 +94,8 @@ class PluginManager:
                 
                 # Subscribe to events if event bus exists
                 if hasattr(self.player, 'event_bus'):
-                    # Standard player events
-                    for event_type, handler_name in [
-                        (self.player.STATE_CHANGED, 'on_state_changed'),
-                        (self.player.TRACK_CHANGED, 'on_track_changed'),
-                        (self.player.SOURCE_CHANGED, 'on_source_changed'),
-                        (self.player.POSITION_CHANGED, 'on_position_changed'),
-                        (self.player.VOLUME_CHANGED, 'on_volume_changed'),
-                        # Legacy events for backward compatibility
-                        ('on_play', 'on_play'),
-                        ('on_pause', 'on_pause'),
-                        ('on_stop', 'on_stop'),
-                        ('on_playlist_loaded', 'on_playlist_loaded'),
-                        ('on_volume_change', 'on_volume_change'),
-                        ('on_shutdown', 'on_shutdown')
-                    ]:
-                        if hasattr(plugin, handler_name):
-                            self.player.event_bus.subscribe(event_type, getattr(plugin, handler_name))
+                    for event_type, handler in self.plugins[plugin_name]['handlers']:
+                        self.player.event_bus.subscribe(event_type, handler)
                 
                 # Update available plugins info
                 if plugin_name in self.available_plugins:
@@ -190,30 +175,8 @@ class PluginManager:
                 
                 # Unsubscribe from all events if event_bus exists
                 if hasattr(self.player, 'event_bus'):
-                    # Unsubscribe from standard events
-                    for event_type in [
-                        self.player.STATE_CHANGED,
-                        self.player.TRACK_CHANGED,
-                        self.player.SOURCE_CHANGED,
-                        self.player.POSITION_CHANGED,
-                        self.player.VOLUME_CHANGED,
-                        'on_play', 'on_pause', 'on_stop', 'on_playlist_loaded', 
-                        'on_volume_change', 'on_shutdown'
-                    ]:
-                        handler_name = event_type
-                        if event_type == self.player.STATE_CHANGED:
-                            handler_name = 'on_state_changed'
-                        elif event_type == self.player.TRACK_CHANGED:
-                            handler_name = 'on_track_changed'
-                        elif event_type == self.player.SOURCE_CHANGED:
-                            handler_name = 'on_source_changed'
-                        elif event_type == self.player.POSITION_CHANGED:
-                            handler_name = 'on_position_changed'
-                        elif event_type == self.player.VOLUME_CHANGED:
-                            handler_name = 'on_volume_changed'
-                            
-                        if hasattr(plugin_instance, handler_name):
-                            self.player.event_bus.unsubscribe(event_type, getattr(plugin_instance, handler_name))
+                    for event_type, handler in self.plugins[plugin_name]['handlers']:
+                        self.player.event_bus.unsubscribe(event_type, handler)
                 
                 # Call shutdown method if it exists
                 if hasattr(plugin_instance, 'on_shutdown'):
@@ -243,12 +206,38 @@ class PluginManager:
         self.save_settings()
         return True
     
+    def _event_handlers(self, plugin_instance):
+        """Bind a plugin's event handlers once, as (event_type, handler) pairs"""
+        handlers = []
+        for event_type, handler_name in [
+            # Standard player events
+            (self.player.STATE_CHANGED, 'on_state_changed'),
+            (self.player.TRACK_CHANGED, 'on_track_changed'),
+            (self.player.SOURCE_CHANGED, 'on_source_changed'),
+            (self.player.POSITION_CHANGED, 'on_position_changed'),
+            (self.player.VOLUME_CHANGED, 'on_volume_changed'),
+            # Legacy events for backward compatibility
+            ('on_play', 'on_play'),
+            ('on_pause', 'on_pause'),
+            ('on_stop', 'on_stop'),
+            ('on_playlist_loaded', 'on_playlist_loaded'),
+            ('on_playlist_changed', 'on_playlist_changed'),
+            ('on_volume_change', 'on_volume_change'),
+            ('on_shuffle_change', 'on_shuffle_change'),
+            ('on_shutdown', 'on_shutdown')
+        ]:
+            handler = getattr(plugin_instance, handler_name, None)
+            if handler is not None:
+                handlers.append((event_type, handler))
+        return handlers
+    
     def register_plugin(self, plugin_name, plugin_instance):
         """Register a plugin with the manager"""
         self.plugins[plugin_name] = {
             'instance': plugin_instance,
             'name': plugin_instance.name if hasattr(plugin_instance, 'name') else plugin_name,
-            'command_name': plugin_instance.command_name if hasattr(plugin_instance, 'command_name') else plugin_name.lower()
+            'command_name': plugin_instance.command_name if hasattr(plugin_instance, 'command_name') else plugin_name.lower(),
+            'handlers': self._event_handlers(plugin_instance) if self.player else []
         }
         # Update available plugins status
         if plugin_name in self.available_plugins:
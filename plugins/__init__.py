@@ -129,7 +129,7 @@ class BasePlugin(ABC, Generic[T]):
                     
                     # Store track start time if transitioning to PLAYING
                     if self.current_state == 'PLAYING' and old_state != 'PLAYING':
-                        self.track_start_time = time.time() - self.paused_position
+                        self.track_start_time = time.monotonic() - self.paused_position
                     
                     # Store paused position if transitioning to PAUSED
                     if self.current_state == 'PAUSED' and old_state == 'PLAYING':
@@ -357,7 +357,7 @@ class BasePlugin(ABC, Generic[T]):
             self.current_track = data.get('track_name')
             # Reset tracking variables
             if self.current_state == 'PLAYING':
-                self.track_start_time = time.time()
+                self.track_start_time = time.monotonic()
                 self.paused_position = 0
             # Call plugin-specific hook
             self.on_track_changed_hook(data)
@@ -381,7 +381,7 @@ class BasePlugin(ABC, Generic[T]):
             # If position jumped significantly, adjust our tracking
             if abs(position - self.get_audio_position()) > 1.0:
                 if self.current_state == 'PLAYING':
-                    self.track_start_time = time.time() - position
+                    self.track_start_time = time.monotonic() - position
                 elif self.current_state == 'PAUSED':
                     self.paused_position = position
             # Call plugin-specific hook
@@ -486,7 +486,7 @@ Available commands:
             
         # Store start time for position tracking
         if success:
-            self.track_start_time = time.time() - start_pos
+            self.track_start_time = time.monotonic() - start_pos
             self.current_state = 'PLAYING'
             
             # Update playback info
@@ -527,7 +527,7 @@ Available commands:
             self.current_state = 'PLAYING'
             
             # Adjust start time to maintain correct position tracking
-            current_time = time.time()
+            current_time = time.monotonic()
             self.track_start_time = current_time - self.paused_position
             
             # Update playback info
@@ -595,7 +595,7 @@ Available commands:
             
         # Fallback to time-based tracking
         if self.track_start_time > 0:
-            return time.time() - self.track_start_time
+            return time.monotonic() - self.track_start_time
             
         return 0.0
 
@@ -0,0 +1,144 @@
+import os
+import pytest
+from modules import media_handler
+from modules.media_handler import MediaHandler
+
+
+@pytest.fixture
+def handler(tmp_path, monkeypatch):
+    """A MediaHandler whose index and caches live under tmp_path."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    handler = MediaHandler()
+    yield handler
+    handler.cleanup()
+
+
+def index_files(handler, *filenames):
+    """Put files straight into the index and rebuild its search views."""
+    music_dir = os.path.join(os.getcwd(), "music")
+    for i, filename in enumerate(filenames):
+        path = os.path.join(music_dir, filename)
+        handler.media_index[path] = {'filename': filename, 'mtime': i, 'added_on': i}
+    handler._rebuild_index_views()
+    return music_dir
+
+
+@pytest.fixture(autouse=True)
+def substring_scorer(monkeypatch):
+    """Use the built-in substring scorer, whose scores the tests can predict."""
+    monkeypatch.setattr(media_handler, "fuzz_process", None)
+
+
+def test_search_keeps_prefix_and_substring_matches(handler):
+    # "love" is a whole token of one file, but the others only contain it
+    music_dir = index_files(handler, "love.mp3", "lovely day.mp3", "glove box.mp3", "other.mp3")
+
+    results = handler.search_tracks("love", limit=20)
+
+    names = {os.path.relpath(path, music_dir) for path in results}
+    assert {"love.mp3", "lovely day.mp3", "glove box.mp3"} <= names
+    assert "other.mp3" not in names
+
+
+def test_search_narrows_to_token_matches_when_they_fill_the_limit(handler):
+    music_dir = index_files(handler, "love song.mp3", "love theme.mp3", "lovely.mp3")
+
+    results = handler.search_tracks("love", limit=2)
+
+    names = {os.path.relpath(path, music_dir) for path in results}
+    assert names == {"love song.mp3", "love theme.mp3"}
+
+
+def test_search_filters_do_not_drop_substring_matches(handler):
+    music_dir = index_files(handler, "love.mp3", "lovely.ogg", "love.wav")
+
+    results = handler.search_tracks("love", limit=20, media_types=["ogg"])
+
+    assert [os.path.relpath(path, music_dir) for path in results] == ["lovely.ogg"]
+
+
+def test_converted_cache_prunes_least_recently_used(handler):
+    os.makedirs(handler.cache_dir)
+    paths = []
+    for i, name in enumerate(["old.wav", "middle.wav", "new.wav"]):
+        path = os.path.join(handler.cache_dir, name)
+        with open(path, 'wb') as f:
+            f.write(b'\0' * 100)
+        os.utime(path, (1000 + i, 1000 + i))
+        paths.append(path)
+    handler.converted_files = {"/music/old.flac": paths[0], "/music/new.flac": paths[2]}
+    handler.cache_max_bytes = 200
+
+    handler._prune_converted_cache()
+
+    assert sorted(os.listdir(handler.cache_dir)) == ["middle.wav", "new.wav"]
+    assert handler.converted_files == {"/music/new.flac": paths[2]}
+
+
+def test_temporary_sources_are_converted_without_caching(handler, monkeypatch):
+    source = os.path.join(handler.temp_dir, "yt_audio_1.m4a")
+    with open(source, 'wb') as f:
+        f.write(b'audio')
+
+    class FakeStream:
+        def output(self, *args, **kwargs):
+            return self
+
+        def run(self, **kwargs):
+            return b'RIFF', b''
+
+    monkeypatch.setattr(media_handler.ffmpeg, "input", lambda path: FakeStream(), raising=False)
+
+    playable = handler.convert_if_needed(source)
+
+    assert playable.getvalue() == b'RIFF'
+    assert not os.path.exists(handler.cache_dir)
+    os.remove(source)
+
+
+def test_indexed_media_respects_recursive(handler):
+    music_dir = os.path.join(os.getcwd(), "music")
+    for directory, filename, mtime in [(music_dir, "Top.mp3", 2), (os.path.join(music_dir, "sub"), "deep.mp3", 1)]:
+        path = os.path.join(directory, filename)
+        handler.media_index[path] = {'filename': filename, 'directory': directory, 'mtime': mtime}
+
+    (flat,) = handler.get_indexed_media([music_dir])
+    (nested,) = handler.get_indexed_media([music_dir], recursive=True)
+
+    assert flat == [(os.path.join(music_dir, "Top.mp3"), 2, "top.mp3")]
+    assert sorted(name for _, _, name in nested) == ["deep.mp3", "top.mp3"]
+
+
+@pytest.fixture
+def linked_library(tmp_path):
+    """A library with a symlinked file, a symlinked directory and a symlink loop."""
+    outside = tmp_path / "outside"
+    (outside / "album").mkdir(parents=True)
+    (outside / "single.mp3").touch()
+    (outside / "album" / "track.mp3").touch()
+    music = tmp_path / "music"
+    music.mkdir()
+    (music / "local.mp3").touch()
+    try:
+        (music / "single.mp3").symlink_to(outside / "single.mp3")
+        (music / "album").symlink_to(outside / "album", target_is_directory=True)
+        (outside / "album" / "loop").symlink_to(music, target_is_directory=True)
+    except OSError:
+        pytest.skip("symlinks are not supported here")
+    return str(music)
+
+
+def test_parallel_scan_follows_symlinks_once(handler, linked_library):
+    signatures = handler._scan_signatures_parallel([linked_library])
+
+    names = sorted(os.path.relpath(path, linked_library) for path in signatures)
+    assert names == [os.path.join("album", "track.mp3"), "local.mp3", "single.mp3"]
+
+
+def test_directory_scan_follows_symlinks_once(handler, linked_library):
+    tracks = handler.load_media_from_directory(linked_library, recursive=True)
+
+    names = sorted(os.path.relpath(path, linked_library) for path in tracks)
+    assert names == [os.path.join("album", "track.mp3"), "local.mp3", "single.mp3"]
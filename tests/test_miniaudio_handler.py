@@ -0,0 +1,56 @@
+import array
+import pytest
+
+pytest.importorskip("miniaudio")
+
+from modules.miniaudio_handler import MiniaudioHandler
+
+
+@pytest.fixture
+def handler(tmp_path, monkeypatch):
+    """A MiniaudioHandler whose index and caches live under tmp_path."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    handler = MiniaudioHandler()
+    yield handler
+    handler.cleanup()
+
+
+def test_full_volume_passes_samples_through(handler):
+    samples = array.array('h', [1000, -1000, 32767, -32768])
+
+    assert handler._apply_volume(samples) is samples
+
+
+def test_volume_scales_the_whole_chunk(handler):
+    handler.set_audio_volume(0.5)
+    samples = array.array('h', [1000, -1000, 32767, -32768, 0])
+
+    scaled = handler._apply_volume(samples)
+
+    assert scaled.typecode == 'h'
+    assert list(scaled) == [500, -500, 16383, -16384, 0]
+
+
+def test_zero_volume_silences_the_chunk(handler):
+    handler.set_audio_volume(0.0)
+
+    scaled = handler._apply_volume(array.array('h', [1200, -700, 5]))
+
+    assert list(scaled) == [0, 0, 0]
+
+
+def test_position_follows_frames_handed_to_the_device(handler):
+    handler._on_progress(handler.SAMPLE_RATE)
+    handler._on_progress(handler.SAMPLE_RATE // 2)
+
+    assert handler.get_audio_position() == 1500
+
+
+def test_end_of_stream_marks_playback_finished(handler):
+    handler._playing = True
+
+    handler._on_end()
+
+    assert not handler.is_audio_playing()
@@ -0,0 +1,29 @@
+import pytest
+
+pygame = pytest.importorskip("pygame")
+pytest.importorskip("miniaudio")
+
+from modules.miniaudio_handler import MiniaudioHandler
+from modules.player import MusicPlayer
+
+
+@pytest.fixture
+def player(tmp_path, monkeypatch):
+    """A bare MusicPlayer with a MiniaudioHandler whose index lives under tmp_path."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    monkeypatch.setenv("SDL_VIDEODRIVER", "dummy")
+    pygame.quit()
+    player = MusicPlayer.__new__(MusicPlayer)
+    player.END_EVENT = pygame.USEREVENT + 1
+    player.media_handler = MiniaudioHandler(end_event=player.END_EVENT)
+    yield player
+    player.media_handler.cleanup()
+    pygame.quit()
+
+
+def test_miniaudio_backend_leaves_the_mixer_closed(player):
+    player._init_pygame()
+
+    assert not pygame.mixer.get_init()